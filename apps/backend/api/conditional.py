@@ -0,0 +1,73 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.data_versions import data_versions
+
+# Client and proxy lifetime for the read endpoints, nginx micro-caches on it
+HTTP_CACHE_MAX_AGE_SECONDS = int(os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", "10"))
+# How long a cache may keep serving a stale copy while it revalidates
+HTTP_CACHE_STALE_SECONDS = int(os.getenv("HTTP_CACHE_STALE_SECONDS", "30"))
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    ours = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == ours for candidate in if_none_match.split(","))
+
+
+class CacheValidators:
+    """ETag, Last-Modified and Cache-Control for one response, and whether the client's copy is current"""
+
+    def __init__(self, request: Request, etag: str, last_modified: datetime):
+        # HTTP dates have whole-second precision
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        self.headers = {
+            "ETag": etag,
+            "Last-Modified": format_datetime(last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE_SECONDS}, stale-while-revalidate={HTTP_CACHE_STALE_SECONDS}",
+        }
+        self.not_modified = self._client_is_current(request, etag, last_modified)
+
+    def _client_is_current(self, request: Request, etag: str, last_modified: datetime) -> bool:
+        # If-None-Match wins when both are sent
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, etag)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+
+async def cache_validators(
+    request: Request,
+    db: AsyncSession,
+    table: str,
+    as_of: Optional[datetime] = None,
+) -> CacheValidators:
+    """Validators from a table's data version and the request's query string"""
+    version, updated_at = await data_versions.get(db, table)
+    # Responses that also change with the clock, e.g. a rolling date window,
+    # pass as_of to move both validators forward
+    last_modified = max(updated_at, as_of) if as_of else updated_at
+
+    # The same data and the same query give the same body
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(f"{request.url.path}?{query}|{as_of}".encode(), digest_size=8).hexdigest()
+
+    return CacheValidators(request, f'W/"{version}-{digest}"', last_modified)
@@ -1,12 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, any_, bindparam, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from models.database import get_db
-from models.materials import MaterialsNews, ResearchPaper
+from api.conditional import cache_validators
+from api.pagination import decode_cursor, encode_cursor, estimate_count, exact_count, newest_after, paginate_keyset
+from api.schemas import (
+    LOOKUP_MAX_FETCH, LOOKUP_MAX_IDENTIFIERS, PAPER_FIELDS, FastJSONResponse, PaperLookup,
+    news_columns, paper_columns, parse_fields, project, rows_to_dicts,
+)
+from api.streaming import EXPORT_MEDIA_TYPES, STREAM_MEDIA_TYPES, encode_event, export_rows, pyarrow
+from models.database import get_async_db, get_async_sessionmaker
+from models.materials import MaterialsNews, ResearchPaper, StatsSummary, ENABLE_TRIGRAM_SEARCH
 from services.arxiv_service import ArxivService
 from services.multi_source_service import MultiSourceService
+from services.dedup import PaperDeduplicator, deduplicate_papers, normalize_arxiv_id, normalize_doi
+from services.cache import create_upstream_cache, make_cache_key
+from services.hot_feed import HotFeed
+from services.http import upstream_http
+from services.records import parse_datetime_utc
 
 router = APIRouter(prefix="/api", tags=["materials"])
 
@@ -14,43 +29,114 @@ router = APIRouter(prefix="/api", tags=["materials"])
 arxiv_service = ArxivService()
 multi_source_service = MultiSourceService()
 
+# Cache in front of every upstream fetch
+upstream_cache = create_upstream_cache()
+
+# Newest papers overall, per focus and per journal, held in memory for the
+# listings most traffic asks for
+hot_feed = HotFeed(paper_columns(None))
+
+
+def validate_cursor(cursor: Optional[str]):
+    """Reject malformed cursors with a 400 before querying"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """A query parameter datetime in the naive UTC form the columns store"""
+    return parse_datetime_utc(value).replace(tzinfo=None) if value else None
+
+
+def export_response(sessions: async_sessionmaker, stmt, columns: list, export_format: str, name: str, cursor: Optional[str]) -> StreamingResponse:
+    """Stream an export as a file download, one server-side cursor batch at a time"""
+    if export_format == "parquet" and pyarrow is None:
+        raise HTTPException(status_code=400, detail="Parquet export requires pyarrow")
+    
+    # The body opens its own session. A resumed CSV leaves out the header so it
+    # appends to the part already downloaded
+    return StreamingResponse(
+        export_rows(sessions, stmt, columns, export_format, header=not cursor),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"', "X-Accel-Buffering": "no"}
+    )
+
+
+async def count_total(db: AsyncSession, stmt, exact_total: bool, cursor: Optional[str], offset: int, rows: list, next_cursor: Optional[str]):
+    """Return (total, is_estimate) for a paginated listing"""
+    # A last page reached by offset already tells us the exact total
+    if not cursor and next_cursor is None and (rows or offset == 0):
+        return offset + len(rows), False
+    if exact_total:
+        return await exact_count(db, stmt), False
+    return max(await estimate_count(db, stmt), offset + len(rows)), True
+
 
 @router.get("/papers")
 async def get_papers(
-    page: int = Query(1, ge=1),
+    request: Request,
+    page: int = Query(1, ge=1, description="Offset page, ignored when a cursor is given"),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    exact_total: bool = Query(False, description="Count exactly instead of estimating"),
     journal: Optional[str] = None,
     materials_focus: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,doi to skip abstracts"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get research papers with pagination and filtering"""
+    """Get research papers with keyset pagination and filtering"""
+    validate_cursor(cursor)
+    columns = paper_columns(fields)
+    
     try:
-        # Calculate offset
-        offset = (page - 1) * limit
-        
-        # Build query
-        query = db.query(ResearchPaper)
-        
-        # Apply filters
-        if journal:
-            query = query.filter(ResearchPaper.journal.ilike(f"%{journal}%"))
-        
-        if materials_focus:
-            query = query.filter(ResearchPaper.materials_focus.contains([materials_focus]))
+        validators = await cache_validators(request, db, "research_papers")
+        if validators.not_modified:
+            return validators.not_modified_response()
         
-        # Get total count
-        total = query.count()
-        
-        # Get paginated results
-        papers = query.order_by(ResearchPaper.published_at.desc()).offset(offset).limit(limit).all()
+        offset = (page - 1) * limit
         
-        return {
+        # The first pages come from memory, with exact totals from the stats
+        # summary. Deeper pages and unusual filters fall through to the database
+        hot = await hot_feed.page(
+            db, limit, offset, decode_cursor(cursor) if cursor else None,
+            journal=journal, materials_focus=materials_focus
+        )
+        if hot is not None:
+            papers, has_more, total = hot
+            next_cursor = encode_cursor(papers[-1]["published_at"], papers[-1]["id"]) if has_more else None
+            total_is_estimate = False
+            papers = project(papers, fields, PAPER_FIELDS)
+        else:
+            # Build query over only the returned columns
+            stmt = select(*columns)
+            
+            # Apply filters
+            if journal:
+                stmt = stmt.where(ResearchPaper.journal.ilike(f"%{journal}%"))
+            
+            if materials_focus:
+                stmt = stmt.where(ResearchPaper.materials_focus.contains([materials_focus]))
+            
+            # Keyset pages stay fast however deep the client walks, the offset
+            # is only used by page=N callers without a cursor
+            rows, next_cursor = await paginate_keyset(db, stmt, ResearchPaper, limit, cursor, offset=offset)
+            papers = rows_to_dicts(rows)
+            
+            # Exact counts scan the whole filtered set, estimate by default
+            total, total_is_estimate = await count_total(db, stmt, exact_total, cursor, offset, rows, next_cursor)
+        
+        return FastJSONResponse({
             "papers": papers,
             "total": total,
+            "total_is_estimate": total_is_estimate,
             "page": page,
             "limit": limit,
-            "pages": (total + limit - 1) // limit
-        }
+            "pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
+        }, headers=validators.headers)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching papers: {str(e)}")
@@ -58,46 +144,173 @@ async def get_papers(
 
 @router.get("/papers/recent")
 async def get_recent_papers(
+    request: Request,
     days: int = Query(7, ge=1, le=365),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,doi to skip abstracts"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get recent papers from the last N days"""
+    columns = paper_columns(fields)
+    
     try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        
-        papers = db.query(ResearchPaper)\
-            .filter(ResearchPaper.published_at >= cutoff_date)\
-            .order_by(ResearchPaper.published_at.desc())\
-            .limit(20)\
-            .all()
-        
-        return {"papers": papers, "days": days}
+        # The window rolls forward, so the response also changes by the minute
+        now = datetime.utcnow().replace(second=0, microsecond=0)
+        validators = await cache_validators(request, db, "research_papers", as_of=now)
+        if validators.not_modified:
+            return validators.not_modified_response()
+        
+        cutoff_date = now - timedelta(days=days)
+        
+        papers = await hot_feed.recent(db, cutoff_date, 20)
+        if papers is not None:
+            papers = project(papers, fields, PAPER_FIELDS)
+        else:
+            result = await db.execute(
+                select(*columns)
+                .where(ResearchPaper.published_at >= cutoff_date)
+                .order_by(ResearchPaper.published_at.desc(), ResearchPaper.id.desc())
+                .limit(20)
+            )
+            papers = rows_to_dicts(result.all())
+        
+        return FastJSONResponse({"papers": papers, "days": days}, headers=validators.headers)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching recent papers: {str(e)}")
 
 
+@router.get("/papers/export")
+async def export_papers(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$", description="ndjson, csv or parquet"),
+    since: Optional[datetime] = Query(None, description="Only papers published at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only papers published before this time"),
+    journal: Optional[str] = None,
+    materials_focus: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,doi to skip abstracts"),
+    cursor: Optional[str] = Query(None, description="Resume after this row, encoded as /api/papers cursors are"),
+    sessions: async_sessionmaker = Depends(get_async_sessionmaker)
+):
+    """Stream every matching paper newest first, for bulk downloads"""
+    validate_cursor(cursor)
+    columns = paper_columns(fields)
+    
+    stmt = select(*columns)
+    if since:
+        stmt = stmt.where(ResearchPaper.published_at >= naive_utc(since))
+    if until:
+        stmt = stmt.where(ResearchPaper.published_at < naive_utc(until))
+    if journal:
+        stmt = stmt.where(ResearchPaper.journal.ilike(f"%{journal}%"))
+    if materials_focus:
+        stmt = stmt.where(ResearchPaper.materials_focus.contains([materials_focus]))
+    
+    return export_response(sessions, newest_after(stmt, ResearchPaper, cursor), columns, format, "papers", cursor)
+
+
+@router.post("/papers/lookup")
+async def lookup_papers(
+    lookup: PaperLookup,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,doi to skip abstracts"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Resolve lists of DOIs and arXiv IDs to stored papers in one query"""
+    if len(lookup.dois) + len(lookup.arxiv_ids) > LOOKUP_MAX_IDENTIFIERS:
+        raise HTTPException(status_code=400, detail=f"At most {LOOKUP_MAX_IDENTIFIERS} identifiers per lookup")
+    # doi and arxiv_id are always read to match rows back to what was sent
+    names = set(parse_fields(fields, PAPER_FIELDS)) | {"doi", "arxiv_id"}
+    columns = [getattr(ResearchPaper, name) for name in PAPER_FIELDS if name in names]
+    
+    try:
+        # Stored identifiers are normalized, so the lookup keys are too
+        dois = {sent: normalize_doi(sent) for sent in lookup.dois}
+        arxiv_ids = {sent: normalize_arxiv_id(sent) for sent in lookup.arxiv_ids}
+        
+        papers = []
+        if any(dois.values()) or any(arxiv_ids.values()):
+            # One array parameter per column, probed on its unique index,
+            # instead of a bind per identifier
+            result = await db.execute(
+                select(*columns)
+                .where(or_(
+                    ResearchPaper.doi == any_(bindparam("dois", sorted({doi for doi in dois.values() if doi}), type_=ARRAY(String))),
+                    ResearchPaper.arxiv_id == any_(bindparam("arxiv_ids", sorted({arxiv_id for arxiv_id in arxiv_ids.values() if arxiv_id}), type_=ARRAY(String))),
+                ))
+                .order_by(ResearchPaper.published_at.desc(), ResearchPaper.id.desc())
+            )
+            papers = rows_to_dicts(result.all())
+        
+        by_doi = {paper["doi"]: paper["id"] for paper in papers if paper["doi"]}
+        by_arxiv_id = {paper["arxiv_id"]: paper["id"] for paper in papers if paper["arxiv_id"]}
+        missing_arxiv_ids = [sent for sent, arxiv_id in arxiv_ids.items() if arxiv_id not in by_arxiv_id]
+        
+        fetched, not_fetched = [], []
+        if lookup.fetch_missing:
+            # Malformed IDs would only come back as ArXiv error entries
+            wanted = sorted({arxiv_ids[sent] for sent in missing_arxiv_ids if arxiv_ids[sent]})
+            # Capped so the request isn't held open for batch after paced batch,
+            # the rest are listed for the client to send again
+            fetched = await arxiv_service.fetch_by_ids(wanted[:LOOKUP_MAX_FETCH])
+            skipped = set(wanted[LOOKUP_MAX_FETCH:])
+            not_fetched = [sent for sent in missing_arxiv_ids if arxiv_ids[sent] in skipped]
+        
+        return FastJSONResponse({
+            "papers": project(papers, fields, PAPER_FIELDS),
+            "count": len(papers),
+            # Paper id per identifier as sent
+            "matches": {
+                "dois": {sent: by_doi[doi] for sent, doi in dois.items() if doi in by_doi},
+                "arxiv_ids": {sent: by_arxiv_id[arxiv_id] for sent, arxiv_id in arxiv_ids.items() if arxiv_id in by_arxiv_id},
+            },
+            "missing": {
+                "dois": [sent for sent, doi in dois.items() if doi not in by_doi],
+                "arxiv_ids": missing_arxiv_ids,
+            },
+            "fetched": fetched,
+            "not_fetched": not_fetched,
+        })
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error looking up papers: {str(e)}")
+
+
 @router.get("/papers/search")
 async def search_papers(
+    request: Request,
     q: str = Query(..., min_length=2),
     max_results: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    fuzzy: bool = Query(False, description="Also match titles by trigram similarity"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,doi to skip abstracts"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search papers by title, abstract, or keywords"""
+    if fuzzy and not ENABLE_TRIGRAM_SEARCH:
+        raise HTTPException(status_code=400, detail="Fuzzy search requires ENABLE_TRIGRAM_SEARCH=true")
+    columns = paper_columns(fields)
+    
     try:
-        search_term = f"%{q}%"
-        
-        papers = db.query(ResearchPaper)\
-            .filter(
-                (ResearchPaper.title.ilike(search_term)) |
-                (ResearchPaper.abstract.ilike(search_term)) |
-                (ResearchPaper.keywords.any(lambda x: x.ilike(search_term)))
-            )\
-            .order_by(ResearchPaper.published_at.desc())\
-            .limit(max_results)\
-            .all()
-        
-        return {"papers": papers, "query": q, "count": len(papers)}
+        validators = await cache_validators(request, db, "research_papers")
+        if validators.not_modified:
+            return validators.not_modified_response()
+        
+        # Full-text match on the weighted search_vector (GIN indexed)
+        ts_query = func.websearch_to_tsquery("english", q)
+        matches = ResearchPaper.search_vector.op("@@")(ts_query)
+        rank = func.ts_rank(ResearchPaper.search_vector, ts_query)
+        
+        if fuzzy:
+            # Trigram similarity on titles (GIN trigram indexed)
+            matches = matches | ResearchPaper.title.op("%")(q)
+            rank = func.greatest(rank, func.similarity(ResearchPaper.title, q))
+        
+        result = await db.execute(
+            select(*columns)
+            .where(matches)
+            .order_by(rank.desc(), ResearchPaper.published_at.desc())
+            .limit(max_results)
+        )
+        papers = rows_to_dicts(result.all())
+        
+        return FastJSONResponse({"papers": papers, "query": q, "count": len(papers)}, headers=validators.headers)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching papers: {str(e)}")
@@ -110,14 +323,17 @@ async def fetch_arxiv_papers(
 ):
     """Fetch latest materials science papers from ArXiv"""
     try:
-        papers = arxiv_service.fetch_materials_papers(max_results=max_results, days_back=days_back)
+        papers = await upstream_cache.get_or_fetch(
+            make_cache_key("arxiv", None, max_results, days_back),
+            lambda: arxiv_service.fetch_materials_papers(max_results=max_results, days_back=days_back)
+        )
         
-        return {
+        return FastJSONResponse({
             "papers": papers,
             "count": len(papers),
             "source": "ArXiv",
             "days_back": days_back
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching from ArXiv: {str(e)}")
@@ -130,14 +346,17 @@ async def search_arxiv_by_topic(
 ):
     """Search ArXiv for papers on a specific topic"""
     try:
-        papers = arxiv_service.search_by_topic(topic, max_results=max_results)
+        papers = await upstream_cache.get_or_fetch(
+            make_cache_key("arxiv_topic", topic, max_results),
+            lambda: arxiv_service.search_by_topic(topic, max_results=max_results)
+        )
         
-        return {
+        return FastJSONResponse({
             "papers": papers,
             "topic": topic,
             "count": len(papers),
             "source": "ArXiv"
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching ArXiv: {str(e)}")
@@ -146,18 +365,24 @@ async def search_arxiv_by_topic(
 @router.get("/papers/pubmed")
 async def fetch_pubmed_papers(
     query: str = Query("materials science", description="Search query"),
-    max_results: int = Query(20, ge=1, le=100)
+    max_results: int = Query(20, ge=1, le=100),
+    days_back: Optional[int] = Query(None, ge=1, le=365, description="Only papers added in the last N days")
 ):
     """Fetch materials science papers from PubMed Central"""
     try:
-        papers = await multi_source_service.fetch_from_pubmed_central(query, max_results)
+        since = datetime.utcnow() - timedelta(days=days_back) if days_back else None
+        papers = await upstream_cache.get_or_fetch(
+            make_cache_key("pubmed_central", query, max_results, days_back),
+            lambda: multi_source_service.fetch_from_pubmed_central(query, max_results, since)
+        )
         
-        return {
+        return FastJSONResponse({
             "papers": papers,
             "count": len(papers),
             "source": "PubMed Central",
-            "query": query
-        }
+            "query": query,
+            "days_back": days_back
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching from PubMed Central: {str(e)}")
@@ -166,139 +391,255 @@ async def fetch_pubmed_papers(
 @router.get("/papers/doaj")
 async def fetch_doaj_papers(
     query: str = Query("materials science", description="Search query"),
-    max_results: int = Query(20, ge=1, le=100)
+    max_results: int = Query(20, ge=1, le=100),
+    days_back: Optional[int] = Query(None, ge=1, le=365, description="Only papers added in the last N days")
 ):
     """Fetch materials science papers from Directory of Open Access Journals"""
     try:
-        papers = await multi_source_service.fetch_from_doaj(query, max_results)
+        since = datetime.utcnow() - timedelta(days=days_back) if days_back else None
+        papers = await upstream_cache.get_or_fetch(
+            make_cache_key("doaj", query, max_results, days_back),
+            lambda: multi_source_service.fetch_from_doaj(query, max_results, since)
+        )
         
-        return {
+        return FastJSONResponse({
             "papers": papers,
             "count": len(papers),
             "source": "DOAJ",
-            "query": query
-        }
+            "query": query,
+            "days_back": days_back
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching from DOAJ: {str(e)}")
 
 
+def cached_fetch(query: str, max_results: int):
+    """Fan-out wrapper putting the upstream cache in front of each source, shared with /papers/pubmed and /papers/doaj"""
+    def wrap(source, fetch):
+        return lambda: upstream_cache.get_or_fetch(make_cache_key(source, query, max_results), fetch)
+    return wrap
+
+
 @router.get("/papers/all-sources")
 async def fetch_all_sources(
     query: str = Query("materials science", description="Search query"),
     max_results: int = Query(10, ge=1, le=50)
 ):
-    """Fetch papers from all available sources"""
+    """Fetch papers from all available sources, partial if a source fails or runs out of time"""
     try:
-        results = await multi_source_service.fetch_all_sources(query, max_results)
-        
-        # Combine all papers
+        # Records already carry their source's display name, and dedup
+        # copies before merging so the cached records stay untouched
         all_papers = []
-        for source, papers in results.items():
-            for paper in papers:
-                paper["source"] = source.replace("_", " ").title()
-                all_papers.append(paper)
+        source_counts = {}
+        source_status = {}
+        async for source, papers, status in multi_source_service.fan_out(query, max_results, wrap=cached_fetch(query, max_results)):
+            all_papers.extend(papers)
+            source_counts[source] = len(papers)
+            source_status[source] = status
         
-        # Sort by published date (newest first)
-        all_papers.sort(key=lambda x: x.get("published_at", ""), reverse=True)
+        # One record per paper, with every source it came from in provenance
+        papers = deduplicate_papers(all_papers)
         
-        return {
-            "papers": all_papers,
-            "count": len(all_papers),
-            "sources": list(results.keys()),
+        # Sort by published date (newest first), every source's dates are UTC datetimes
+        papers.sort(key=lambda paper: paper.sort_key, reverse=True)
+        
+        return FastJSONResponse({
+            "papers": papers,
+            "count": len(papers),
+            "duplicates_merged": len(all_papers) - len(papers),
+            "sources": list(source_counts),
             "query": query,
-            "source_counts": {source: len(papers) for source, papers in results.items()}
-        }
+            "source_counts": source_counts,
+            "source_status": source_status,
+            "partial": any(status["status"] != "ok" for status in source_status.values())
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching from all sources: {str(e)}")
 
 
+@router.get("/papers/all-sources/stream")
+async def stream_all_sources(
+    query: str = Query("materials science", description="Search query"),
+    max_results: int = Query(10, ge=1, le=50),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="ndjson or sse")
+):
+    """Stream papers from all sources as each one responds, ending with a summary event"""
+    async def events():
+        source_counts = {}
+        source_status = {}
+        # Papers already sent go out once, later copies only count as duplicates
+        deduplicator = PaperDeduplicator()
+        duplicates = 0
+        
+        async for source, papers, status in multi_source_service.fan_out(query, max_results, wrap=cached_fetch(query, max_results)):
+            for paper in papers:
+                _, is_new = deduplicator.add(paper)
+                if is_new:
+                    yield encode_event("paper", paper.to_dict(), format)
+                else:
+                    duplicates += 1
+            
+            source_counts[source] = len(papers)
+            source_status[source] = status
+            yield encode_event("source", {"source": source, **status}, format)
+        
+        yield encode_event("summary", {
+            "query": query,
+            "count": sum(source_counts.values()) - duplicates,
+            "duplicates_merged": duplicates,
+            "sources": list(source_counts),
+            "source_counts": source_counts,
+            "source_status": source_status,
+            "partial": any(status["status"] != "ok" for status in source_status.values())
+        }, format)
+    
+    # No proxy buffering, each event should reach the client as it is written
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/news")
 async def get_news(
-    page: int = Query(1, ge=1),
+    request: Request,
+    page: int = Query(1, ge=1, description="Offset page, ignored when a cursor is given"),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    exact_total: bool = Query(False, description="Count exactly instead of estimating"),
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,url to skip content"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get materials science news with pagination and filtering"""
+    """Get materials science news with keyset pagination and filtering"""
+    validate_cursor(cursor)
+    columns = news_columns(fields)
+    
     try:
-        offset = (page - 1) * limit
+        validators = await cache_validators(request, db, "materials_news")
+        if validators.not_modified:
+            return validators.not_modified_response()
         
-        query = db.query(MaterialsNews)
+        stmt = select(*columns)
         
         if category:
-            query = query.filter(MaterialsNews.category == category)
+            stmt = stmt.where(MaterialsNews.category == category)
         
-        total = query.count()
-        news = query.order_by(MaterialsNews.published_at.desc()).offset(offset).limit(limit).all()
+        offset = (page - 1) * limit
+        news, next_cursor = await paginate_keyset(db, stmt, MaterialsNews, limit, cursor, offset=offset)
         
-        return {
-            "news": news,
+        total, total_is_estimate = await count_total(db, stmt, exact_total, cursor, offset, news, next_cursor)
+        
+        return FastJSONResponse({
+            "news": rows_to_dicts(news),
             "total": total,
+            "total_is_estimate": total_is_estimate,
             "page": page,
             "limit": limit,
-            "pages": (total + limit - 1) // limit
-        }
+            "pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
+        }, headers=validators.headers)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching news: {str(e)}")
 
 
+@router.get("/news/export")
+async def export_news(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$", description="ndjson, csv or parquet"),
+    since: Optional[datetime] = Query(None, description="Only news published at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only news published before this time"),
+    category: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,url to skip content"),
+    cursor: Optional[str] = Query(None, description="Resume after this row, encoded as /api/news cursors are"),
+    sessions: async_sessionmaker = Depends(get_async_sessionmaker)
+):
+    """Stream every matching news item newest first, for bulk downloads"""
+    validate_cursor(cursor)
+    columns = news_columns(fields)
+    
+    stmt = select(*columns)
+    if since:
+        stmt = stmt.where(MaterialsNews.published_at >= naive_utc(since))
+    if until:
+        stmt = stmt.where(MaterialsNews.published_at < naive_utc(until))
+    if category:
+        stmt = stmt.where(MaterialsNews.category == category)
+    
+    return export_response(sessions, newest_after(stmt, MaterialsNews, cursor), columns, format, "news", cursor)
+
+
+async def read_stats(db: AsyncSession, metric: str, limit: Optional[int] = None) -> list:
+    """Read (key, count) rows for one metric from the trigger-maintained summary"""
+    stmt = select(StatsSummary.key, StatsSummary.count)\
+        .where(StatsSummary.metric == metric, StatsSummary.count > 0)\
+        .order_by(StatsSummary.count.desc(), StatsSummary.key)
+    
+    if limit:
+        stmt = stmt.limit(limit)
+    
+    return (await db.execute(stmt)).all()
+
+
+async def read_total(db: AsyncSession, metric: str) -> int:
+    """Read a total counter from the summary"""
+    total = (await db.execute(
+        select(StatsSummary.count)
+        .where(StatsSummary.metric == metric, StatsSummary.key == "")
+    )).scalar()
+    return total or 0
+
+
 @router.get("/stats/papers")
-async def get_paper_stats(db: Session = Depends(get_db)):
+async def get_paper_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get statistics about research papers"""
     try:
-        total_papers = db.query(ResearchPaper).count()
-        
-        # Papers by journal
-        journals = db.query(ResearchPaper.journal, db.func.count(ResearchPaper.id))\
-            .group_by(ResearchPaper.journal)\
-            .order_by(db.func.count(ResearchPaper.id).desc())\
-            .limit(10)\
-            .all()
-        
-        # Papers by materials focus
-        materials_stats = {}
-        papers = db.query(ResearchPaper.materials_focus).all()
-        for paper in papers:
-            if paper[0]:  # materials_focus is not None
-                for material in paper[0]:
-                    materials_stats[material] = materials_stats.get(material, 0) + 1
-        
-        return {
+        validators = await cache_validators(request, db, "research_papers")
+        if validators.not_modified:
+            return validators.not_modified_response()
+        
+        # Counters are kept current by triggers on research_papers, so this
+        # reads a handful of rows regardless of corpus size
+        total_papers = await read_total(db, "papers_total")
+        journals = await read_stats(db, "papers_journal", limit=10)
+        materials_stats = await read_stats(db, "papers_focus")
+        
+        return FastJSONResponse({
             "total_papers": total_papers,
             "top_journals": [{"journal": j[0], "count": j[1]} for j in journals],
-            "materials_distribution": materials_stats
-        }
+            "materials_distribution": {m[0]: m[1] for m in materials_stats}
+        }, headers=validators.headers)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
 
 
 @router.get("/stats/news")
-async def get_news_stats(db: Session = Depends(get_db)):
+async def get_news_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get statistics about materials science news"""
     try:
-        total_news = db.query(MaterialsNews).count()
-        
-        # News by category
-        categories = db.query(MaterialsNews.category, db.func.count(MaterialsNews.id))\
-            .group_by(MaterialsNews.category)\
-            .all()
+        validators = await cache_validators(request, db, "materials_news")
+        if validators.not_modified:
+            return validators.not_modified_response()
         
-        # News by source
-        sources = db.query(MaterialsNews.source, db.func.count(MaterialsNews.id))\
-            .group_by(MaterialsNews.source)\
-            .order_by(db.func.count(MaterialsNews.id).desc())\
-            .limit(10)\
-            .all()
+        total_news = await read_total(db, "news_total")
+        categories = await read_stats(db, "news_category")
+        sources = await read_stats(db, "news_source", limit=10)
         
-        return {
+        return FastJSONResponse({
             "total_news": total_news,
             "categories": [{"category": c[0], "count": c[1]} for c in categories],
             "top_sources": [{"source": s[0], "count": s[1]} for s in sources]
-        }
+        }, headers=validators.headers)
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching news stats: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching news stats: {str(e)}")
+
+
+@router.get("/stats/upstream")
+async def get_upstream_stats():
+    """Get request scheduler queue depth, wait times and retries per upstream provider"""
+    return {"providers": upstream_http.metrics()}
@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper that keeps the statement's bound parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def encode_cursor(published_at: datetime, row_id: int) -> str:
+    """Encode a (published_at, id) position as an opaque cursor"""
+    payload = json.dumps([published_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        published_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(published_at), int(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def newest_after(stmt: Select, model: Any, cursor: Optional[str] = None) -> Select:
+    """Order a statement newest first, continuing after a cursor when one is given"""
+    stmt = stmt.order_by(model.published_at.desc(), model.id.desc())
+
+    if cursor:
+        published_at, row_id = decode_cursor(cursor)
+        # Row comparison walks the (published_at, id) index from the cursor
+        stmt = stmt.where(tuple_(model.published_at, model.id) < tuple_(published_at, row_id))
+    return stmt
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    stmt: Select,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of rows newest first plus the cursor for the next page"""
+    stmt = newest_after(stmt, model, cursor)
+
+    if not cursor and offset:
+        # Legacy page=N access, gets slower the deeper it goes
+        stmt = stmt.offset(offset)
+
+    # Fetch one extra row to learn whether another page exists, stmt selects
+    # columns that include the model's id and published_at
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].published_at, rows[-1].id)
+
+    return rows, next_cursor
+
+
+async def exact_count(db: AsyncSession, stmt: Select) -> int:
+    """Exact row count of a statement, scans the whole filtered set"""
+    return (await db.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))).scalar_one()
+
+
+async def estimate_count(db: AsyncSession, stmt: Select) -> int:
+    """Row estimate from the planner's statistics instead of an exact count"""
+    plan = (await db.execute(Explain(stmt))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
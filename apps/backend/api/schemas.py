@@ -0,0 +1,86 @@
+import os
+import time
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+
+from models.materials import MaterialsNews, ResearchPaper
+from services.metrics import RESPONSE_ENCODE_SECONDS, add_timing
+from services.records import dumps
+
+# Columns the listing endpoints return, in response order. Rows are selected
+# as these columns only and encoded straight to JSON, no ORM objects
+PAPER_FIELDS = (
+    "id", "title", "authors", "abstract", "journal", "published_at", "doi", "arxiv_id",
+    "impact_factor", "keywords", "materials_focus", "pdf_url", "sources", "created_at", "updated_at",
+)
+NEWS_FIELDS = (
+    "id", "title", "summary", "content", "source", "published_at", "image_url", "url",
+    "category", "tags", "created_at", "updated_at",
+)
+
+# Always selected, keyset cursors are built from them
+KEY_FIELDS = ("id", "published_at")
+
+# DOIs plus arXiv IDs one bulk lookup may ask for
+LOOKUP_MAX_IDENTIFIERS = int(os.getenv("LOOKUP_MAX_IDENTIFIERS", "5000"))
+# Missing arXiv IDs one lookup fetches from ArXiv, whose id_list requests go out
+# seconds apart; the default is a single request
+LOOKUP_MAX_FETCH = int(os.getenv("LOOKUP_MAX_FETCH", "100"))
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson response that also encodes paper records and Decimal columns"""
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        elapsed = time.perf_counter() - started
+        RESPONSE_ENCODE_SECONDS.observe(elapsed)
+        add_timing("encode", elapsed)
+        return body
+
+
+class PaperLookup(BaseModel):
+    """Body of a bulk lookup by DOI and arXiv ID, in any of the forms the sources use"""
+
+    dois: List[str] = Field(default_factory=list, description="e.g. 10.1000/abc or https://doi.org/10.1000/abc")
+    arxiv_ids: List[str] = Field(default_factory=list, description="e.g. 2401.01234v2 or arXiv:cond-mat/0102536")
+    fetch_missing: bool = Field(False, description="Fetch arXiv IDs not stored here from ArXiv")
+
+
+def parse_fields(fields: Optional[str], schema: Sequence[str]) -> List[str]:
+    """Columns requested by a comma-separated fields= value, in schema order"""
+    if not fields:
+        return list(schema)
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(schema)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    requested.update(KEY_FIELDS)
+    return [name for name in schema if name in requested]
+
+
+def paper_columns(fields: Optional[str]) -> list:
+    return [getattr(ResearchPaper, name) for name in parse_fields(fields, PAPER_FIELDS)]
+
+
+def news_columns(fields: Optional[str]) -> list:
+    return [getattr(MaterialsNews, name) for name in parse_fields(fields, NEWS_FIELDS)]
+
+
+def rows_to_dicts(rows: Sequence[Any]) -> List[dict]:
+    """Plain dicts from projected result rows, ready for the encoder"""
+    return [dict(row._mapping) for row in rows]
+
+
+def project(records: Sequence[dict], fields: Optional[str], schema: Sequence[str]) -> List[dict]:
+    """Requested fields of whole-schema dicts, e.g. papers held in memory"""
+    if not fields:
+        return list(records)
+    names = parse_fields(fields, schema)
+    return [{name: record[name] for name in names} for record in records]
@@ -0,0 +1,153 @@
+import csv
+import io
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Sequence
+
+from sqlalchemy import DECIMAL, ARRAY, DateTime, Integer, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.sql import Select
+
+from services.records import dumps
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is optional
+    pyarrow = None
+
+# Response media type per stream format
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+# Response media type per export format
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Rows fetched from the server-side cursor, and encoded, at a time; also the
+# Parquet row group size
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Statement timeout for export cursors, which outlive DB_STATEMENT_TIMEOUT_MS (0 = none)
+EXPORT_STATEMENT_TIMEOUT_MS = int(os.getenv("EXPORT_STATEMENT_TIMEOUT_MS", "600000"))
+
+
+def encode_event(event: str, data: Dict[str, Any], stream_format: str) -> bytes:
+    """Encode one event as an NDJSON line or a Server-Sent Event"""
+    if stream_format == "sse":
+        return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+    return dumps({"event": event, **data}) + b"\n"
+
+
+def csv_cell(value: Any) -> Any:
+    """CSV value for a column, arrays as JSON and datetimes as ISO 8601"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return dumps(value).decode()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(rows: Sequence[Any], names: Sequence[str] = ()) -> bytes:
+    """CSV lines for result rows, preceded by a header when names are given"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if names:
+        writer.writerow(names)
+    writer.writerows([csv_cell(value) for value in row] for row in rows)
+    return out.getvalue().encode()
+
+
+def arrow_type(column: Any):
+    """Parquet column type for a selected SQLAlchemy column"""
+    if isinstance(column.type, Integer):
+        return pyarrow.int64()
+    if isinstance(column.type, DateTime):
+        return pyarrow.timestamp("us")
+    if isinstance(column.type, DECIMAL):
+        return pyarrow.decimal128(column.type.precision, column.type.scale)
+    if isinstance(column.type, ARRAY):
+        return pyarrow.list_(pyarrow.string())
+    return pyarrow.string()
+
+
+class ParquetChunks(io.RawIOBase):
+    """Write-only file a Parquet writer fills, drained after every row group"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def export_rows(sessions: async_sessionmaker, stmt: Select, columns: Sequence[Any], export_format: str, header: bool = True) -> AsyncIterator[bytes]:
+    """Stream a statement's rows through a server-side cursor, encoding one batch at a time"""
+    names = [column.key for column in columns]
+    parquet = None
+    exported = 0
+    # Opened here, so the session lives exactly as long as the body is sent
+    db = sessions()
+    try:
+        # The cursor lives as long as the download, longer than API queries may run
+        await db.execute(select(func.set_config("statement_timeout", str(EXPORT_STATEMENT_TIMEOUT_MS), True)))
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+        if export_format == "parquet":
+            schema = pyarrow.schema([(column.key, arrow_type(column)) for column in columns])
+            sink = ParquetChunks()
+            parquet = pyarrow.parquet.ParquetWriter(sink, schema)
+
+        async for rows in result.partitions():
+            if export_format == "ndjson":
+                yield b"".join(dumps(dict(row._mapping)) + b"\n" for row in rows)
+            elif export_format == "csv":
+                yield encode_csv(rows, names if header else ())
+                header = False
+            else:
+                parquet.write_table(pyarrow.Table.from_pylist([dict(row._mapping) for row in rows], schema))
+                yield sink.drain()
+            exported += len(rows)
+
+        if parquet is not None:
+            # The footer indexes every row group, so it only goes out at the end
+            parquet.close()
+            parquet = None
+            yield sink.drain()
+        elif header and export_format == "csv":
+            yield encode_csv([], names)
+
+    except Exception as e:
+        # The 200 is already sent, so the failure has to show in the body. NDJSON
+        # ends with an error record; CSV and Parquet have no room for one, so the
+        # connection is aborted and the transfer fails. Either way the client can
+        # resume from the cursor of the last complete row it received
+        print(f"Error exporting rows after {exported} rows: {e}")
+        if export_format != "ndjson":
+            raise
+        yield dumps({"error": f"Error exporting rows: {e}", "rows_exported": exported}) + b"\n"
+    finally:
+        if parquet is not None:
+            parquet.close()
+        await db.close()
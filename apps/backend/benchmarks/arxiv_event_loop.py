@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Event loop benchmark for the ArXiv endpoints
+Measures /api/papers latency on its own and again while an ArXiv fetch is in
+flight. With a non-blocking ArXiv client the two distributions should match.
+
+Usage: python benchmarks/arxiv_event_loop.py --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of latencies"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def measure_papers(client: httpx.AsyncClient, requests: int, concurrency: int) -> List[float]:
+    """Fire GET /api/papers requests and return their latencies in ms"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get("/api/papers", params={"limit": 10})
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    return latencies
+
+
+def report(label: str, latencies: List[float]):
+    print(
+        f"{label:<24} n={len(latencies):<5} "
+        f"p50={percentile(latencies, 50):8.1f}ms "
+        f"p95={percentile(latencies, 95):8.1f}ms "
+        f"max={max(latencies):8.1f}ms "
+        f"mean={statistics.mean(latencies):8.1f}ms"
+    )
+
+
+async def run_benchmark(base_url: str, requests: int, concurrency: int, arxiv_results: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0) as client:
+        # Warm up connections and the DB pool
+        await measure_papers(client, concurrency, concurrency)
+
+        baseline = await measure_papers(client, requests, concurrency)
+        report("idle", baseline)
+
+        # Same load while an ArXiv fetch is running on the server
+        arxiv_start = time.perf_counter()
+        arxiv_task = asyncio.create_task(
+            client.get("/api/papers/arxiv/fetch", params={"max_results": arxiv_results})
+        )
+        await asyncio.sleep(0.05)
+        during = await measure_papers(client, requests, concurrency)
+        arxiv_response = await arxiv_task
+        arxiv_ms = (time.perf_counter() - arxiv_start) * 1000
+
+        report("during arxiv fetch", during)
+        print(f"{'arxiv fetch':<24} status={arxiv_response.status_code} took={arxiv_ms:.1f}ms")
+
+        slowdown = percentile(during, 95) / max(percentile(baseline, 95), 0.001)
+        print(f"\np95 slowdown while ArXiv is in flight: {slowdown:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--arxiv-results", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.base_url, args.requests, args.concurrency, args.arxiv_results))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the ArXiv, PubMed Central, DOAJ and CORE APIs
+Each answers after a configurable latency, failing a share of requests with
+a 503, so benchmarks measure our side of a fetch without touching (or being
+throttled by) the real services. Responses recorded by
+benchmarks/record_upstreams.py are replayed from --fixtures, routes without
+a recording answer with generated papers in the real response format.
+
+Usage: python benchmarks/fake_upstreams.py [--port 8900] [--latency-ms 200] [--error-rate 0.05] [--fixtures benchmarks/fixtures]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+# Recorded response per fake route, as written by record_upstreams.py
+FIXTURE_FILES = {
+    "arxiv": "arxiv.xml",
+    "pmc_search": "pmc_esearch.json",
+    "pmc_summary": "pmc_esummary.json",
+    "doaj": "doaj.json",
+    "core": "core.json",
+}
+
+WORDS = ["graphene", "perovskite", "polymer", "alloy", "ceramic", "catalyst", "membrane", "oxide", "thin film", "battery"]
+
+
+def _title(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(6)).capitalize()
+
+
+def _abstract(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(60))
+
+
+def load_fixtures(fixtures_dir: Optional[str]) -> Dict[str, bytes]:
+    """Recorded bodies found in fixtures_dir, keyed like FIXTURE_FILES"""
+    fixtures = {}
+    for route, filename in FIXTURE_FILES.items():
+        path = os.path.join(fixtures_dir, filename) if fixtures_dir else None
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                fixtures[route] = f.read()
+    return fixtures
+
+
+def create_app(latency_seconds: float = 0.2, error_rate: float = 0.0, fixtures_dir: Optional[str] = None) -> FastAPI:
+    """Fake upstream app, every route sleeps latency_seconds, then fails error_rate of requests with a 503"""
+    app = FastAPI()
+    rng = random.Random(7)
+    fixtures = load_fixtures(fixtures_dir)
+
+    @app.middleware("http")
+    async def latency_and_errors(request: Request, call_next):
+        await asyncio.sleep(latency_seconds)
+        if error_rate and rng.random() < error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=503)
+        return await call_next(request)
+
+    def replay(route: str, media_type: str) -> Optional[Response]:
+        body = fixtures.get(route)
+        return Response(body, media_type=media_type) if body is not None else None
+
+    @app.get("/arxiv/api/query")
+    async def arxiv(max_results: int = 10):
+        recorded = replay("arxiv", "application/atom+xml")
+        if recorded:
+            return recorded
+        entries = "".join(
+            f"<entry><id>http://arxiv.org/abs/2401.{rng.randrange(100000):05d}v1</id>"
+            f"<title>{_title(rng)}</title><summary>{_abstract(rng)}</summary>"
+            f"<published>2024-01-05T18:00:00Z</published>"
+            f"<author><name>Ada Lovelace</name></author>"
+            f'<link title="pdf" href="http://arxiv.org/pdf/2401.00001v1"/></entry>'
+            for _ in range(max_results)
+        )
+        return Response(
+            f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>',
+            media_type="application/atom+xml",
+        )
+
+    @app.get("/pmc/esearch.fcgi")
+    async def pmc_search(retmax: int = 10):
+        recorded = replay("pmc_search", "application/json")
+        if recorded:
+            return recorded
+        return {"esearchresult": {"idlist": [str(rng.randrange(10 ** 7)) for _ in range(retmax)]}}
+
+    @app.get("/pmc/esummary.fcgi")
+    async def pmc_summary(id: str):
+        recorded = replay("pmc_summary", "application/json")
+        if recorded:
+            return recorded
+        uids = id.split(",")
+        result = {
+            uid: {
+                "title": _title(rng),
+                "authors": [{"name": "Lovelace A"}],
+                "abstract": _abstract(rng),
+                "fulljournalname": "Journal of Fake Materials",
+                "pubdate": "2024 Jan 5",
+                "articleids": [{"idtype": "doi", "value": f"10.5555/pmc.{uid}"}],
+            }
+            for uid in uids
+        }
+        return {"result": {"uids": uids, **result}}
+
+    @app.get("/doaj/api/search/articles")
+    async def doaj(pageSize: int = 10):
+        recorded = replay("doaj", "application/json")
+        if recorded:
+            return recorded
+        return {"results": [
+            {"bibjson": {
+                "title": _title(rng),
+                "author": [{"name": "Ada Lovelace"}],
+                "abstract": _abstract(rng),
+                "journal": {"title": "Open Fake Materials"},
+                "year": "2024",
+                "identifier": [{"type": "doi", "id": f"10.5555/doaj.{rng.randrange(10 ** 9)}"}],
+                "link": [{"url": "https://example.org/article"}],
+            }}
+            for _ in range(pageSize)
+        ]}
+
+    @app.get("/core/search/works")
+    async def core(limit: int = 10):
+        recorded = replay("core", "application/json")
+        if recorded:
+            return recorded
+        return {"results": [
+            {
+                "title": _title(rng),
+                "authors": [{"name": "Ada Lovelace"}],
+                "abstract": _abstract(rng),
+                "publishedDate": "2024-01-05T00:00:00",
+                "doi": f"10.5555/core.{rng.randrange(10 ** 9)}",
+                "downloadUrl": "https://example.org/core.pdf",
+            }
+            for _ in range(limit)
+        ]}
+
+    @app.exception_handler(Exception)
+    async def error(request: Request, exc: Exception):
+        return JSONResponse({"error": str(exc)}, status_code=500)
+
+    return app
+
+
+def base_urls(base: str) -> Dict[str, str]:
+    """Adapter base URLs pointing at a running fake upstream server"""
+    return {
+        "arxiv": f"{base}/arxiv/api/query",
+        "pubmed_central": f"{base}/pmc",
+        "doaj": f"{base}/doaj/api/search/articles",
+        "core": f"{base}/core/search/works",
+    }
+
+
+@contextmanager
+def run_fake_upstreams(
+    latency_seconds: float = 0.2,
+    port: int = 0,
+    error_rate: float = 0.0,
+    fixtures_dir: Optional[str] = None,
+) -> Iterator[str]:
+    """Serve the fake upstreams on a background thread, yielding the base URL"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", port))
+    app = create_app(latency_seconds, error_rate, fixtures_dir)
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", default=None, help="Directory of recorded responses")
+    args = parser.parse_args()
+
+    with run_fake_upstreams(args.latency_ms / 1000, args.port, args.error_rate, args.fixtures) as base:
+        for source, url in base_urls(base).items():
+            print(f"{source:>15}  {url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
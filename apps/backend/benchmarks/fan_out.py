@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Aggregate throughput of the source fan-out as sources are added
+Runs the executor against the local fake upstreams with 1..N sources (past
+the registered adapters, more copies of them under new names) and reports
+wall time and papers per second. With sources running in parallel, wall
+time should stay near the slowest source's latency (PMC makes two calls)
+until --max-parallel is reached.
+
+Usage: python benchmarks/fan_out.py [--sources 8] [--max-parallel 8] [--latency-ms 200] [--max-results 50]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_upstreams import base_urls, run_fake_upstreams
+from services.http import UpstreamHTTP
+from services.sources import SOURCE_ADAPTERS, SourceExecutor
+
+
+def build_executor(http: UpstreamHTTP, urls, count: int, max_parallel: int) -> SourceExecutor:
+    """Executor over count adapters, cycling through the available registered adapter classes"""
+    classes = [adapter_class for adapter_class in SOURCE_ADAPTERS.values() if adapter_class(http).available]
+    adapters = {}
+    for i in range(count):
+        adapter_class = classes[i % len(classes)]
+        name = adapter_class.name if i < len(classes) else f"{adapter_class.name}_{i // len(classes) + 1}"
+        adapters[name] = adapter_class(http, urls[adapter_class.name])
+    return SourceExecutor(adapters, max_parallel=max_parallel)
+
+
+async def run(base: str, args):
+    # No rate limits or host caps, the fake server is local
+    http = UpstreamHTTP(host_limits={}, rate_limits={}, http2=False)
+    urls = base_urls(base)
+    try:
+        for count in range(1, args.sources + 1):
+            executor = build_executor(http, urls, count, args.max_parallel)
+            timings, papers = [], 0
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                async for _, results, status in executor.fan_out("materials science", args.max_results, budget_seconds=None):
+                    if status["status"] != "ok":
+                        raise RuntimeError(f"fan-out failed: {status}")
+                    papers += len(results)
+                timings.append(time.perf_counter() - start)
+
+            median = statistics.median(timings)
+            print(
+                f"{count:>3} sources  {median * 1000:8.1f}ms median  "
+                f"{papers / args.rounds:7.0f} papers/round  {papers / sum(timings):9.0f} papers/s"
+            )
+    finally:
+        await http.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sources", type=int, default=8)
+    parser.add_argument("--max-parallel", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--max-results", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with run_fake_upstreams(args.latency_ms / 1000) as base:
+        asyncio.run(run(base, args))
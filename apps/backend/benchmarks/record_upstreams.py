@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Record live ArXiv, PubMed Central, DOAJ (and CORE) responses for replay
+Runs one search per source adapter against the real APIs, through the usual
+rate limits, and saves each response body where fake_upstreams.py --fixtures
+picks it up. Needs network access; CORE is only recorded with CORE_API_KEY set.
+
+Usage: python benchmarks/record_upstreams.py [--output benchmarks/fixtures] [--query graphene] [--max-results 50]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.fake_upstreams import FIXTURE_FILES
+from services.http import UpstreamHTTP
+from services.sources import SOURCE_ADAPTERS
+
+
+def fixture_route(url: httpx.URL) -> Optional[str]:
+    """Which fake route a real upstream URL corresponds to"""
+    if url.path.endswith("esearch.fcgi"):
+        return "pmc_search"
+    if url.path.endswith("esummary.fcgi"):
+        return "pmc_summary"
+    for route, host in (("arxiv", "arxiv.org"), ("doaj", "doaj.org"), ("core", "core.ac.uk")):
+        if url.host.endswith(host):
+            return route
+    return None
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests through, keeping the last successful body per fake route"""
+
+    def __init__(self):
+        self.transport = httpx.AsyncHTTPTransport(http2=True)
+        self.bodies: Dict[str, bytes] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        body = await response.aread()
+        route = fixture_route(request.url)
+        if route and response.status_code == 200:
+            self.bodies[route] = body
+        # The body was read (and decompressed) to record it, hand back a
+        # response carrying it as plain content
+        headers = [
+            (key, value) for key, value in response.headers.raw
+            if key.lower() not in (b"content-encoding", b"content-length", b"transfer-encoding")
+        ]
+        return httpx.Response(response.status_code, headers=headers, content=body, extensions=response.extensions)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+async def record(args):
+    transport = RecordingTransport()
+    http = UpstreamHTTP(transport=transport)
+    try:
+        for name, adapter_class in SOURCE_ADAPTERS.items():
+            adapter = adapter_class(http)
+            if not adapter.available:
+                print(f"{name:>15}  skipped, not available")
+                continue
+            papers = await adapter.search(args.query, args.max_results)
+            print(f"{name:>15}  {len(papers)} papers")
+    finally:
+        await http.close()
+
+    os.makedirs(args.output, exist_ok=True)
+    for route, body in transport.bodies.items():
+        path = os.path.join(args.output, FIXTURE_FILES[route])
+        with open(path, "wb") as f:
+            f.write(body)
+        print(f"wrote {path} ({len(body) / 1024:.1f} KiB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+    parser.add_argument("--query", default="graphene")
+    parser.add_argument("--max-results", type=int, default=50)
+    asyncio.run(record(parser.parse_args()))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Requests per second for the paper listing, before and after column projection
+Serves /api/papers in-process against DATABASE_URL and compares the old
+handler (ORM objects through jsonable_encoder) with the projected orjson one,
+with and without abstracts. Only the app's CPU work and the database round
+trips are measured, there is no network in between.
+
+Needs at least --limit papers; --seed N inserts synthetic ones ("bench.N" arXiv IDs)
+Usage: python benchmarks/serialization.py [--limit 100] [--requests 200] [--seed 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.pagination import estimate_count
+from main import app
+from models.database import async_engine, engine, get_async_db
+from models.materials import ResearchPaper
+
+SEED_SQL = """
+INSERT INTO research_papers (title, authors, abstract, journal, published_at, arxiv_id, keywords, materials_focus)
+SELECT
+    'Benchmark paper ' || n || ' on perovskite thin films',
+    ARRAY['Author ' || n, 'Coauthor ' || n],
+    repeat('Abstract sentence about grain boundaries in oxide ceramics. ', 25),
+    'ArXiv',
+    now() - n * interval '1 hour',
+    'bench.' || n,
+    ARRAY['perovskite', 'thin film'],
+    ARRAY['ceramics', 'energy materials']
+FROM generate_series(1, :count) AS n
+ON CONFLICT DO NOTHING
+"""
+
+legacy = APIRouter()
+
+
+@legacy.get("/bench/legacy-papers", response_class=JSONResponse)
+async def legacy_papers(limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    """The listing as it was, whole ORM rows encoded by jsonable_encoder"""
+    stmt = select(ResearchPaper)
+    rows = (await db.execute(
+        stmt.order_by(ResearchPaper.published_at.desc(), ResearchPaper.id.desc()).limit(limit + 1)
+    )).scalars().all()
+    return {"papers": rows[:limit], "total": await estimate_count(db, stmt)}
+
+
+async def measure(client: httpx.AsyncClient, path: str, params: dict, count: int) -> float:
+    # Warm the connection pool and statement caches first
+    for _ in range(5):
+        (await client.get(path, params=params)).raise_for_status()
+
+    start = time.perf_counter()
+    for _ in range(count):
+        (await client.get(path, params=params)).raise_for_status()
+    return count / (time.perf_counter() - start)
+
+
+async def run(args):
+    app.include_router(legacy)
+    variants = [
+        ("ORM + jsonable_encoder", "/bench/legacy-papers", {"limit": args.limit}),
+        ("projected + orjson", "/api/papers", {"limit": args.limit}),
+        ("projected, no abstract", "/api/papers", {"limit": args.limit, "fields": "title,authors,journal,doi,arxiv_id,pdf_url"}),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            baseline = None
+            for label, path, params in variants:
+                rate = await measure(client, path, params, args.requests)
+                size = len((await client.get(path, params=params)).content)
+                baseline = baseline or rate
+                print(f"{label:<24} {rate:8.1f} req/s  {rate / baseline:5.2f}x  {size / 1024:7.1f} KiB/response")
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.seed:
+        with engine.begin() as connection:
+            connection.execute(text(SEED_SQL), {"count": args.seed})
+
+    asyncio.run(run(args))
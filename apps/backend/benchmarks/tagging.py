@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the materials tagger
+Tags a few thousand abstracts with the old per-term scan, MaterialsTagger.tag
+and MaterialsTagger.tag_many. Abstracts come from research_papers, or from a
+file with one abstract per line (plain text or NDJSON with an "abstract" key).
+
+Usage: python benchmarks/tagging.py [--file abstracts.ndjson] [--limit 5000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.tagging import KEYWORD_TERMS, MATERIALS_CATEGORIES, materials_tagger
+
+
+def legacy_tag(text: str):
+    """The per-term scan the services used before the shared tagger"""
+    keywords = [term for term in KEYWORD_TERMS if term.lower() in text.lower()][:10]
+
+    focus_areas = []
+    text_lower = text.lower()
+    for category, terms in MATERIALS_CATEGORIES.items():
+        for term in terms:
+            if term in text_lower:
+                focus_areas.append(category)
+                break
+
+    return keywords, list(set(focus_areas))
+
+
+def load_abstracts(path: str, limit: int) -> List[str]:
+    if path:
+        abstracts = []
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                abstracts.append(json.loads(line)["abstract"] if line.startswith("{") else line)
+                if len(abstracts) >= limit:
+                    break
+        return abstracts
+
+    from models.database import SessionLocal
+    from models.materials import ResearchPaper
+
+    db = SessionLocal()
+    try:
+        return [row[0] for row in db.query(ResearchPaper.abstract).limit(limit).all()]
+    finally:
+        db.close()
+
+
+def time_it(label: str, count: int, repeat: int, func: Callable[[], object]):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<20} {best * 1000:9.1f}ms  {count / best:12,.0f} abstracts/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--file", help="abstracts file, defaults to reading research_papers")
+    parser.add_argument("--limit", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    abstracts = load_abstracts(args.file, args.limit)
+    if not abstracts:
+        sys.exit("No abstracts to tag, pass --file or ingest some papers first")
+
+    chars = sum(len(abstract) for abstract in abstracts)
+    print(f"Tagging {len(abstracts)} abstracts ({chars / len(abstracts):.0f} chars on average)\n")
+
+    time_it("legacy scan", len(abstracts), args.repeat, lambda: [legacy_tag(a) for a in abstracts])
+    time_it("tagger.tag", len(abstracts), args.repeat, lambda: [materials_tagger.tag(a) for a in abstracts])
+    time_it("tagger.tag_many", len(abstracts), args.repeat, lambda: materials_tagger.tag_many(abstracts))
@@ -1,15 +1,43 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from models.database import create_tables
+from models.database import AsyncSessionLocal, async_engine, engine, run_migrations
 from models.materials import MaterialsNews, ResearchPaper  # Import to ensure tables are created
 from api import router as api_router
+from api.schemas import FastJSONResponse
+from api.materials import arxiv_service, hot_feed, multi_source_service
+from api.metrics import TimingMiddleware, router as metrics_router
+from services.http import upstream_http
+from services.ingestion_service import IngestionService, INGESTION_ENABLED
+from services.metrics import event_loop_monitor, instrument_engine
+
+ingestion_service = IngestionService(arxiv_service, multi_source_service)
 
-app = FastAPI(title="MaSOT API")
+# Statement timings for /metrics and Server-Timing, request path and ingestion
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
-# Create database tables on startup
-@app.on_event("startup")
-def on_startup():
-    create_tables()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Apply database migrations, load the hot feed, open the shared upstream
+    # HTTP pool and start the background ingestion worker
+    run_migrations()
+    await hot_feed.warm(AsyncSessionLocal)
+    await upstream_http.start()
+    event_loop_monitor.start()
+    if INGESTION_ENABLED:
+        ingestion_service.start()
+    try:
+        yield
+    finally:
+        # Stop the worker before closing the connections it uses
+        await ingestion_service.stop()
+        await event_loop_monitor.stop()
+        await upstream_http.close()
+        await async_engine.dispose()
+
+app = FastAPI(title="MaSOT API", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Add CORS middleware to allow cross-origin requests
 app.add_middleware(
@@ -20,8 +48,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so its latency covers the whole stack
+app.add_middleware(TimingMiddleware)
+
 # Include the main API router
 app.include_router(api_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 async def root():
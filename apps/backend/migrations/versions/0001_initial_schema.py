@@ -0,0 +1,211 @@
+"""Initial schema: tables, full-text search, keyset indexes and stats triggers
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+Databases created by the old create_all() startup already hold some of these
+tables, so every step here checks for or tolerates existing objects.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Weighted title (A) > keywords (B) > abstract (C)
+SEARCH_VECTOR_EXPRESSION = """
+    setweight(to_tsvector('english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce(array_to_string({row}keywords, ' '), '')), 'B') ||
+    setweight(to_tsvector('english', coalesce({row}abstract, '')), 'C')
+"""
+
+SEARCH_INDEX_DDL = [
+    "ALTER TABLE research_papers ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION research_papers_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format(row="NEW.")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER research_papers_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, keywords, abstract ON research_papers
+    FOR EACH ROW EXECUTE FUNCTION research_papers_search_vector_update()
+    """,
+    f"UPDATE research_papers SET search_vector = {SEARCH_VECTOR_EXPRESSION.format(row='')} WHERE search_vector IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_research_papers_search_vector ON research_papers USING gin (search_vector)",
+]
+
+KEYSET_INDEX_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_research_papers_published_at_id ON research_papers (published_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_materials_news_published_at_id ON materials_news (published_at DESC, id DESC)",
+]
+
+# Summary counters for the stats endpoints. Statement-level triggers read the
+# transition tables, so a batch upsert applies one aggregated delta per key.
+STATS_DELTAS = {
+    "research_papers": """
+        SELECT 'papers_total' AS metric, '' AS key, {sign} AS delta FROM {rows}
+        UNION ALL SELECT 'papers_journal', journal, {sign} FROM {rows}
+        UNION ALL SELECT 'papers_focus', focus, {sign} FROM {rows}, unnest(materials_focus) AS focus
+    """,
+    "materials_news": """
+        SELECT 'news_total' AS metric, '' AS key, {sign} AS delta FROM {rows}
+        UNION ALL SELECT 'news_category', category, {sign} FROM {rows}
+        UNION ALL SELECT 'news_source', source, {sign} FROM {rows}
+    """,
+}
+
+APPLY_STATS_DELTAS = """
+    INSERT INTO stats_summary (metric, key, count, updated_at)
+    SELECT metric, coalesce(key, ''), sum(delta), now() FROM ({deltas}) AS deltas
+    GROUP BY 1, 2
+    HAVING sum(delta) <> 0
+    ON CONFLICT (metric, key) DO UPDATE
+    SET count = stats_summary.count + EXCLUDED.count, updated_at = now()
+"""
+
+
+def _stats_trigger_ddl(table: str) -> list:
+    deltas = STATS_DELTAS[table]
+    inserted = deltas.format(sign=1, rows="new_rows")
+    deleted = deltas.format(sign=-1, rows="old_rows")
+
+    statements = [f"""
+    CREATE OR REPLACE FUNCTION {table}_stats_update() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {APPLY_STATS_DELTAS.format(deltas=inserted)};
+        ELSIF TG_OP = 'DELETE' THEN
+            {APPLY_STATS_DELTAS.format(deltas=deleted)};
+        ELSE
+            {APPLY_STATS_DELTAS.format(deltas=inserted + " UNION ALL " + deleted)};
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """]
+
+    # Transition tables need one trigger per event
+    for event, referencing in (
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+    ):
+        statements.append(f"""
+        CREATE OR REPLACE TRIGGER {table}_stats_{event.lower()}_trigger
+        AFTER {event} ON {table} REFERENCING {referencing}
+        FOR EACH STATEMENT EXECUTE FUNCTION {table}_stats_update()
+        """)
+
+    return statements
+
+
+STATS_DDL = _stats_trigger_ddl("research_papers") + _stats_trigger_ddl("materials_news") + [
+    # Backfill once, for tables that held rows before the triggers existed
+    f"""
+    INSERT INTO stats_summary (metric, key, count, updated_at)
+    SELECT metric, coalesce(key, ''), sum(delta), now() FROM (
+        {STATS_DELTAS["research_papers"].format(sign=1, rows="research_papers")}
+        UNION ALL
+        {STATS_DELTAS["materials_news"].format(sign=1, rows="materials_news")}
+    ) AS deltas
+    WHERE NOT EXISTS (SELECT 1 FROM stats_summary)
+    GROUP BY 1, 2
+    """,
+]
+
+
+def create_tables(existing: set):
+    if "materials_news" not in existing:
+        op.create_table(
+            "materials_news",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(500), nullable=False),
+            sa.Column("summary", sa.Text(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("source", sa.String(100), nullable=False),
+            sa.Column("published_at", sa.DateTime(), nullable=False),
+            sa.Column("image_url", sa.String(500), nullable=True),
+            sa.Column("url", sa.String(500), nullable=False),
+            sa.Column("category", sa.String(50), nullable=False),
+            sa.Column("tags", postgresql.ARRAY(sa.String()), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+        op.create_index("ix_materials_news_id", "materials_news", ["id"])
+
+    if "research_papers" not in existing:
+        op.create_table(
+            "research_papers",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(500), nullable=False),
+            sa.Column("authors", postgresql.ARRAY(sa.String()), nullable=False),
+            sa.Column("abstract", sa.Text(), nullable=False),
+            sa.Column("journal", sa.String(200), nullable=False),
+            sa.Column("published_at", sa.DateTime(), nullable=False),
+            sa.Column("doi", sa.String(100), nullable=True, unique=True),
+            sa.Column("arxiv_id", sa.String(50), nullable=True, unique=True),
+            sa.Column("impact_factor", sa.DECIMAL(5, 3), nullable=True),
+            sa.Column("keywords", postgresql.ARRAY(sa.String()), nullable=True),
+            sa.Column("materials_focus", postgresql.ARRAY(sa.String()), nullable=True),
+            sa.Column("pdf_url", sa.String(500), nullable=True),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+        op.create_index("ix_research_papers_id", "research_papers", ["id"])
+
+    if "source_watermarks" not in existing:
+        op.create_table(
+            "source_watermarks",
+            sa.Column("source", sa.String(50), primary_key=True),
+            sa.Column("last_published_at", sa.DateTime(), nullable=True),
+            sa.Column("last_run_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+
+    if "upstream_cache" not in existing:
+        op.create_table(
+            "upstream_cache",
+            sa.Column("key", sa.String(300), primary_key=True),
+            sa.Column("value", sa.Text(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+
+    if "stats_summary" not in existing:
+        op.create_table(
+            "stats_summary",
+            sa.Column("metric", sa.String(50), primary_key=True),
+            sa.Column("key", sa.String(200), primary_key=True),
+            sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        )
+        op.create_index("ix_stats_summary_metric_count", "stats_summary", ["metric", "count"])
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    create_tables(existing)
+
+    for statement in SEARCH_INDEX_DDL + KEYSET_INDEX_DDL + STATS_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for table in ("research_papers", "materials_news"):
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_stats_update() CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS research_papers_search_vector_update() CASCADE")
+
+    for table in ("stats_summary", "upstream_cache", "source_watermarks", "research_papers", "materials_news"):
+        op.drop_table(table)
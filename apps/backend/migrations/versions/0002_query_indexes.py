@@ -0,0 +1,75 @@
+"""Indexes for the filtered listing endpoints
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+- GIN on research_papers.materials_focus for the materials_focus filter (@>)
+- (category, published_at DESC, id DESC) on materials_news for /api/news?category=
+- materials_news.source for per-source lookups
+- trigram GIN on research_papers.journal (ILIKE '%...%') and title (fuzzy
+  search), only where the server ships pg_trgm
+
+Indexes are built CONCURRENTLY so a deploy doesn't block ingestion writes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    "ix_research_papers_materials_focus": "research_papers USING gin (materials_focus)",
+    "ix_materials_news_category_published_at_id": "materials_news (category, published_at DESC, id DESC)",
+    "ix_materials_news_source": "materials_news (source)",
+}
+
+TRIGRAM_INDEXES = {
+    "ix_research_papers_journal_trgm": "research_papers USING gin (journal gin_trgm_ops)",
+    "ix_research_papers_title_trgm": "research_papers USING gin (title gin_trgm_ops)",
+}
+
+
+def create_index_concurrently(name: str, definition: str):
+    # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would skip
+    bind = op.get_bind()
+    invalid = bind.execute(
+        sa.text("SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = indexrelid WHERE relname = :name AND NOT indisvalid"),
+        {"name": name},
+    ).first()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def trigram_available() -> bool:
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first() is not None
+
+
+def upgrade() -> None:
+    indexes = dict(INDEXES)
+    if trigram_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        indexes.update(TRIGRAM_INDEXES)
+    else:
+        print("pg_trgm is not available, skipping the trigram indexes")
+
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, definition in indexes.items():
+            create_index_concurrently(name, definition)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in list(TRIGRAM_INDEXES) + list(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
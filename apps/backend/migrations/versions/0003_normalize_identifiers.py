@@ -0,0 +1,65 @@
+"""Normalize stored DOIs and arXiv IDs and record paper provenance
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 14:00:00
+
+DOIs were stored as the sources sent them (PMC "doi: 10...", DOAJ ISSNs in
+the doi column) and arXiv IDs with their version suffix, so the same paper
+could be stored twice. This rewrites both into the forms services/dedup.py
+produces, dropping the older row where two collapse onto the same value.
+Values that aren't DOIs at all become NULL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same rules as normalize_doi / normalize_arxiv_id: strip the arxiv: / arxiv.org
+# prefix and .pdf suffix, then take the trailing new- or old-style ID sans version
+NORMALIZED_DOI = r"nullif(rtrim(substring(lower(doi) from '10\.[0-9]{4,9}/\S+'), '.,;'), '')"
+NORMALIZED_ARXIV_ID = r"""lower(substring(
+    regexp_replace(
+        regexp_replace(btrim(arxiv_id, E' \t\n\r\f\013'), '^(arxiv:|https?://(export\.)?arxiv\.org/(abs|pdf)/)', '', 'i'),
+        '\.pdf$', ''
+    )
+    from '(?i)([0-9]{4}\.[0-9]{4,5}|[a-z][a-z-]*(\.[a-z]{2})?/[0-9]{7})(v[0-9]+)?$'
+))"""
+
+
+def collapse(column: str, normalized: str):
+    # Keep one row per normalized value, preferring rows that also carry the other ID
+    other = "arxiv_id" if column == "doi" else "doi"
+    op.execute(f"""
+        DELETE FROM research_papers WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY {normalized}
+                    ORDER BY ({other} IS NOT NULL) DESC, updated_at DESC NULLS LAST, id DESC
+                ) AS rank
+                FROM research_papers
+                WHERE {normalized} IS NOT NULL
+            ) AS ranked
+            WHERE rank > 1
+        )
+    """)
+    op.execute(f"UPDATE research_papers SET {column} = {normalized} WHERE {column} IS DISTINCT FROM {normalized}")
+
+
+def upgrade() -> None:
+    op.add_column("research_papers", sa.Column("sources", postgresql.ARRAY(sa.String()), nullable=True))
+
+    collapse("arxiv_id", NORMALIZED_ARXIV_ID)
+    collapse("doi", NORMALIZED_DOI)
+
+
+def downgrade() -> None:
+    op.drop_column("research_papers", "sources")
@@ -0,0 +1,34 @@
+"""Per-source, per-query fetch watermarks for date-windowed ingestion
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 16:00:00
+
+Ingestion asks each source only for papers added since the end of its last
+complete window, tracked per source and query in fetch_watermarks.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fetch_watermarks",
+        sa.Column("source", sa.String(50), primary_key=True),
+        sa.Column("query", sa.Text(), primary_key=True),
+        sa.Column("fetched_until", sa.DateTime(), nullable=True),
+        sa.Column("last_run_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fetch_watermarks")
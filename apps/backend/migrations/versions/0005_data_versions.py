@@ -0,0 +1,89 @@
+"""Trigger-maintained data versions for conditional GETs
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 18:00:00
+
+Every statement that changes research_papers or materials_news bumps that
+table's row in data_versions. The read endpoints build their ETag and
+Last-Modified from it, so an unchanged table answers polls with a 304.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("research_papers", "materials_news")
+
+# Statements that touched no rows, e.g. an upsert batch of nothing, leave the
+# version alone. TRUNCATE has no transition table to look at
+BUMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION bump_data_version() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'TRUNCATE' THEN
+        IF NOT EXISTS (SELECT 1 FROM changed_rows) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    INSERT INTO data_versions (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, 1, now() AT TIME ZONE 'utc')
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = data_versions.version + 1, updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _version_trigger_ddl(table: str) -> list:
+    # Transition tables need one trigger per event, TRUNCATE has none
+    statements = [
+        f"""
+        CREATE OR REPLACE TRIGGER {table}_version_{event.lower()}_trigger
+        AFTER {event} ON {table} REFERENCING {referencing}
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()
+        """
+        for event, referencing in (
+            ("INSERT", "NEW TABLE AS changed_rows"),
+            ("UPDATE", "NEW TABLE AS changed_rows"),
+            ("DELETE", "OLD TABLE AS changed_rows"),
+        )
+    ]
+    statements.append(f"""
+    CREATE OR REPLACE TRIGGER {table}_version_truncate_trigger
+    AFTER TRUNCATE ON {table}
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_data_version()
+    """)
+    return statements
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_versions",
+        sa.Column("table_name", sa.String(50), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.execute(BUMP_FUNCTION)
+    for table in VERSIONED_TABLES:
+        for statement in _version_trigger_ddl(table):
+            op.execute(statement)
+
+    # Seed a version per table so the first poll already has a validator
+    op.execute(f"""
+    INSERT INTO data_versions (table_name, version, updated_at)
+    SELECT table_name, 1, now() AT TIME ZONE 'utc'
+    FROM unnest(ARRAY{list(VERSIONED_TABLES)}) AS table_name
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS bump_data_version() CASCADE")
+    op.drop_table("data_versions")
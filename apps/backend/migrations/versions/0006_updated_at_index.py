@@ -0,0 +1,42 @@
+"""Index research_papers.updated_at for the hot feed's change reads
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 22:00:00
+
+After every data version bump each worker's hot feed reads the rows changed
+since its last refresh (updated_at >= ...), on the request path. Without an
+index that is a sequential scan of the table.
+
+Built CONCURRENTLY so a deploy doesn't block ingestion writes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_research_papers_updated_at"
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside the migration transaction
+    with op.get_context().autocommit_block():
+        # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would skip
+        invalid = op.get_bind().execute(
+            sa.text("SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = indexrelid WHERE relname = :name AND NOT indisvalid"),
+            {"name": INDEX_NAME},
+        ).first()
+        if invalid:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON research_papers (updated_at)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}")
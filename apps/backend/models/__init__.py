@@ -1,4 +1,4 @@
-from .database import get_db, create_tables
-from .materials import MaterialsNews, ResearchPaper
+from .database import get_db, get_async_db, run_migrations
+from .materials import DataVersion, FetchWatermark, MaterialsNews, ResearchPaper, SourceWatermark, StatsSummary, UpstreamCacheEntry
 
-__all__ = ['MaterialsNews', 'ResearchPaper', 'get_db', 'create_tables'] 
\ No newline at end of file
+__all__ = ['DataVersion', 'FetchWatermark', 'MaterialsNews', 'ResearchPaper', 'SourceWatermark', 'StatsSummary', 'UpstreamCacheEntry', 'get_db', 'get_async_db', 'run_migrations'] 
\ No newline at end of file
@@ -1,8 +1,14 @@
+import os
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, DECIMAL, ARRAY
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Text, DECIMAL, Index
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from .database import Base
 
+# Fuzzy title search, needs the pg_trgm indexes from migration 0002
+ENABLE_TRIGRAM_SEARCH = os.getenv("ENABLE_TRIGRAM_SEARCH", "false").lower() == "true"
+
 
 class MaterialsNews(Base):
     __tablename__ = "materials_news"
@@ -20,6 +26,13 @@ class MaterialsNews(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Keyset pagination order, overall and within a category
+        Index("ix_materials_news_published_at_id", published_at.desc(), id.desc()),
+        Index("ix_materials_news_category_published_at_id", category, published_at.desc(), id.desc()),
+        Index("ix_materials_news_source", source),
+    )
+
 
 class ResearchPaper(Base):
     __tablename__ = "research_papers"
@@ -36,5 +49,72 @@ class ResearchPaper(Base):
     keywords = Column(ARRAY(String), nullable=True)
     materials_focus = Column(ARRAY(String), nullable=True)
     pdf_url = Column(String(500), nullable=True)
+    sources = Column(ARRAY(String), nullable=True)  # every source this paper was merged from
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now()) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Weighted title (A) > keywords (B) > abstract (C), kept current by a trigger
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        Index("ix_research_papers_search_vector", "search_vector", postgresql_using="gin"),
+        # Keyset pagination order
+        Index("ix_research_papers_published_at_id", published_at.desc(), id.desc()),
+        # materials_focus @> filter
+        Index("ix_research_papers_materials_focus", materials_focus, postgresql_using="gin"),
+        # Rows changed since the hot feed's last refresh
+        Index("ix_research_papers_updated_at", updated_at),
+        # Trigram journal/title indexes are created by migration 0002 when pg_trgm exists
+    )
+
+
+class SourceWatermark(Base):
+    __tablename__ = "source_watermarks"
+
+    source = Column(String(50), primary_key=True)
+    last_published_at = Column(DateTime, nullable=True)  # newest paper seen for this source
+    last_run_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class FetchWatermark(Base):
+    __tablename__ = "fetch_watermarks"
+
+    source = Column(String(50), primary_key=True)
+    query = Column(Text, primary_key=True)  # normalized query the window applies to
+    fetched_until = Column(DateTime, nullable=True)  # end of the last complete fetch window
+    last_run_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class UpstreamCacheEntry(Base):
+    __tablename__ = "upstream_cache"
+
+    key = Column(String(300), primary_key=True)  # source|normalized query|max_results|days_back
+    value = Column(Text, nullable=False)  # JSON encoded response
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+
+
+class StatsSummary(Base):
+    __tablename__ = "stats_summary"
+
+    # papers_total, papers_journal, papers_focus, news_total, news_category, news_source
+    metric = Column(String(50), primary_key=True)
+    key = Column(String(200), primary_key=True)  # journal, focus, category or source; '' for totals
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Top-N reads per metric
+        Index("ix_stats_summary_metric_count", "metric", "count"),
+    )
+
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    # Bumped by triggers on every statement that changes the table (migration 0005)
+    table_name = Column(String(50), primary_key=True)  # research_papers or materials_news
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now())  # UTC time of the last change
@@ -1,4 +1,5 @@
 from .arxiv_service import ArxivService
 from .multi_source_service import MultiSourceService
+from .ingestion_service import IngestionService
 
-__all__ = ['ArxivService', 'MultiSourceService'] 
\ No newline at end of file
+__all__ = ['ArxivService', 'MultiSourceService', 'IngestionService'] 
\ No newline at end of file
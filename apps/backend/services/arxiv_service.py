@@ -1,36 +1,25 @@
-import arxiv
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import re
+from typing import List, Dict, Any, Optional
+
+from .http import UpstreamHTTP
+from .metrics import SOURCE_ERRORS
+from .records import PaperRecord
+from .sources import MATERIALS_KEYWORDS
+from .sources.arxiv import ArxivAdapter, extract_doi, submitted_date_range
+from .tagging import materials_tagger
 
 
 class ArxivService:
-    def __init__(self):
-        self.materials_keywords = [
-            "materials science",
-            "nanomaterials",
-            "graphene",
-            "carbon nanotubes",
-            "quantum dots",
-            "perovskite",
-            "metal organic frameworks",
-            "MOF",
-            "2D materials",
-            "composite materials",
-            "polymer",
-            "ceramic",
-            "metallic",
-            "semiconductor",
-            "superconductor",
-            "catalyst",
-            "battery materials",
-            "solar cell materials",
-            "biomaterials",
-            "smart materials"
-        ]
+    """The ArXiv materials feed, on top of the ArXiv source adapter"""
 
-    def build_search_query(self, days_back: int = 30) -> str:
-        """Build a comprehensive search query for materials science papers"""
+    def __init__(self, http: Optional[UpstreamHTTP] = None):
+        self.materials_keywords = MATERIALS_KEYWORDS
+        self.adapter = ArxivAdapter(http)
+        self.http = self.adapter.http
+        self.api_url = self.adapter.base_url
+
+    def build_search_query(self, days_back: Optional[int] = 30, since: Optional[datetime] = None, until: Optional[datetime] = None) -> str:
+        """Build a comprehensive search query for materials science papers submitted in the window"""
         # Base query for materials science
         base_query = " OR ".join([f'"{keyword}"' for keyword in self.materials_keywords])
         
@@ -53,140 +42,75 @@ class ArxivService:
         # Combine queries
         full_query = f"({base_query}) AND ({innovation_query})"
         
+        # Restrict to the submission window, an explicit since wins over days_back
+        if since is None and days_back is not None:
+            since = datetime.utcnow() - timedelta(days=days_back)
+        if since is not None:
+            full_query = f"{full_query} AND {submitted_date_range(since, until)}"
+        
         return full_query
 
-    def fetch_materials_papers(self, max_results: int = 50, days_back: int = 30) -> List[Dict[str, Any]]:
+    async def fetch_materials_papers(self, max_results: int = 50, days_back: Optional[int] = 30, since: Optional[datetime] = None) -> List[PaperRecord]:
         """Fetch materials science papers from ArXiv"""
         try:
-            # Build search query
-            query = self.build_search_query(days_back)
-            
-            # Search ArXiv
-            search = arxiv.Search(
-                query=query,
-                max_results=max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate,
-                sort_order=arxiv.SortOrder.Descending
-            )
-            
-            papers = []
-            for result in search.results():
-                # Extract authors
-                authors = [author.name for author in result.authors]
-                
-                # Extract keywords from summary
-                keywords = self.extract_keywords(result.summary)
-                
-                # Determine materials focus
-                materials_focus = self.identify_materials_focus(result.summary)
-                
-                # Create paper object
-                paper = {
-                    "title": result.title,
-                    "authors": authors,
-                    "abstract": result.summary,
-                    "journal": "ArXiv",
-                    "published_at": result.published,
-                    "arxiv_id": result.entry_id.split('/')[-1],
-                    "doi": self.extract_doi(result.summary),
-                    "keywords": keywords,
-                    "materials_focus": materials_focus,
-                    "pdf_url": result.pdf_url,
-                    "url": result.entry_id
-                }
-                
-                papers.append(paper)
-            
-            return papers
+            return await self.search_materials_papers(max_results, days_back=days_back, since=since)
             
         except Exception as e:
+            SOURCE_ERRORS.labels("arxiv", type(e).__name__).inc()
             print(f"Error fetching papers from ArXiv: {e}")
             return []
 
+    async def search_materials_papers(
+        self,
+        max_results: int = 50,
+        days_back: Optional[int] = 30,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Search ArXiv for materials science papers submitted in the window, from the offset-th, raising on upstream errors"""
+        # Build search query
+        query = self.build_search_query(days_back, since=since, until=until)
+        
+        # Search ArXiv
+        return await self.adapter.fetch_feed(query, max_results, sort_order="descending", start=offset)
+
+    async def fetch_by_ids(self, arxiv_ids: List[str]) -> List[PaperRecord]:
+        """Fetch papers by arXiv ID, in id_list batches"""
+        try:
+            return await self.adapter.fetch_by_ids(arxiv_ids)
+            
+        except Exception as e:
+            SOURCE_ERRORS.labels("arxiv", type(e).__name__).inc()
+            print(f"Error fetching papers by ID from ArXiv: {e}")
+            return []
+
     def extract_keywords(self, text: str) -> List[str]:
         """Extract potential keywords from text"""
-        # Common materials science terms
-        keywords = []
-        
-        # Look for technical terms
-        technical_terms = [
-            "nanoparticle", "nanostructure", "nanocomposite", "nanotechnology",
-            "quantum", "electronic", "optical", "magnetic", "thermal",
-            "mechanical", "electrochemical", "photovoltaic", "catalytic",
-            "synthesis", "characterization", "fabrication", "processing"
-        ]
-        
-        for term in technical_terms:
-            if term.lower() in text.lower():
-                keywords.append(term)
-        
-        return keywords[:10]  # Limit to 10 keywords
+        return materials_tagger.extract_keywords(text)
 
     def identify_materials_focus(self, text: str) -> List[str]:
         """Identify the main materials focus from text"""
-        materials_categories = {
-            "metals": ["metal", "alloy", "steel", "aluminum", "copper", "titanium"],
-            "ceramics": ["ceramic", "oxide", "nitride", "carbide"],
-            "polymers": ["polymer", "plastic", "resin", "composite"],
-            "nanomaterials": ["nanoparticle", "nanotube", "nanowire", "quantum dot"],
-            "2D materials": ["graphene", "molybdenum disulfide", "boron nitride"],
-            "biomaterials": ["biomaterial", "biocompatible", "tissue engineering"],
-            "energy materials": ["battery", "solar cell", "fuel cell", "supercapacitor"],
-            "electronic materials": ["semiconductor", "conductor", "insulator"]
-        }
-        
-        focus_areas = []
-        text_lower = text.lower()
-        
-        for category, terms in materials_categories.items():
-            for term in terms:
-                if term in text_lower:
-                    focus_areas.append(category)
-                    break
-        
-        return list(set(focus_areas))  # Remove duplicates
+        return materials_tagger.identify_materials_focus(text)
 
     def extract_doi(self, text: str) -> str:
         """Extract DOI from text if present"""
-        doi_pattern = r'10\.\d{4,}/[-._;()/:\w]+'
-        match = re.search(doi_pattern, text)
-        return match.group() if match else None
+        return extract_doi(text)
 
-    def get_recent_papers(self, days: int = 7) -> List[Dict[str, Any]]:
+    async def get_recent_papers(self, days: int = 7) -> List[PaperRecord]:
         """Get papers from the last N days"""
-        return self.fetch_materials_papers(max_results=20, days_back=days)
+        return await self.fetch_materials_papers(max_results=20, days_back=days)
 
-    def search_by_topic(self, topic: str, max_results: int = 20) -> List[Dict[str, Any]]:
+    async def search_by_topic(self, topic: str, max_results: int = 20) -> List[PaperRecord]:
         """Search for papers on a specific topic"""
         try:
-            search = arxiv.Search(
-                query=f'"{topic}" AND materials',
-                max_results=max_results,
-                sort_by=arxiv.SortCriterion.SubmittedDate
-            )
-            
-            papers = []
-            for result in search.results():
-                authors = [author.name for author in result.authors]
-                
-                paper = {
-                    "title": result.title,
-                    "authors": authors,
-                    "abstract": result.summary,
-                    "journal": "ArXiv",
-                    "published_at": result.published,
-                    "arxiv_id": result.entry_id.split('/')[-1],
-                    "doi": self.extract_doi(result.summary),
-                    "keywords": self.extract_keywords(result.summary),
-                    "materials_focus": self.identify_materials_focus(result.summary),
-                    "pdf_url": result.pdf_url,
-                    "url": result.entry_id
-                }
-                
-                papers.append(paper)
-            
-            return papers
+            return await self.adapter.search(topic, max_results)
             
         except Exception as e:
+            SOURCE_ERRORS.labels("arxiv", type(e).__name__).inc()
             print(f"Error searching for topic '{topic}': {e}")
-            return [] 
\ No newline at end of file
+            return []
+
+    async def close(self):
+        """Close the upstream HTTP connections"""
+        await self.http.close()
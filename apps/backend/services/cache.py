@@ -0,0 +1,175 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+
+from models.database import SessionLocal
+from models.materials import UpstreamCacheEntry
+from .records import dumps, loads_records
+
+# Cache settings from environment
+UPSTREAM_CACHE_TTL_SECONDS = int(os.getenv("UPSTREAM_CACHE_TTL_SECONDS", "300"))
+UPSTREAM_CACHE_MAX_ENTRIES = int(os.getenv("UPSTREAM_CACHE_MAX_ENTRIES", "256"))
+UPSTREAM_CACHE_BACKEND = os.getenv("UPSTREAM_CACHE_BACKEND", "memory")  # memory or postgres
+
+# Purge expired shared entries once every this many writes
+PURGE_EVERY_WRITES = 100
+
+
+def make_cache_key(source: str, query: Optional[str], max_results: int, days_back: Optional[int] = None) -> str:
+    """Build a cache key from the source and its normalized query parameters"""
+    normalized_query = " ".join((query or "").lower().split())
+    return f"{source}|{normalized_query}|{max_results}|{days_back if days_back is not None else ''}"
+
+
+class PostgresCacheBackend:
+    """Shared cache backend so hits carry across uvicorn workers"""
+
+    def __init__(self):
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[Tuple[Any, datetime]]:
+        db = SessionLocal()
+        try:
+            entry = db.get(UpstreamCacheEntry, key)
+            if entry is None or entry.expires_at <= datetime.utcnow():
+                return None
+            # Cached values are paper lists, rebuilt as records
+            return loads_records(entry.value), entry.expires_at
+        finally:
+            db.close()
+
+    def set(self, key: str, value: Any, expires_at: datetime):
+        db = SessionLocal()
+        try:
+            encoded = dumps(value).decode()
+            stmt = insert(UpstreamCacheEntry).values(key=key, value=encoded, expires_at=expires_at)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["key"],
+                set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at},
+            )
+            db.execute(stmt)
+
+            self._writes += 1
+            if self._writes % PURGE_EVERY_WRITES == 0:
+                db.execute(delete(UpstreamCacheEntry).where(UpstreamCacheEntry.expires_at <= datetime.utcnow()))
+
+            db.commit()
+        finally:
+            db.close()
+
+
+class UpstreamCache:
+    """TTL + LRU cache for upstream responses with request coalescing"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = UPSTREAM_CACHE_TTL_SECONDS,
+        max_entries: int = UPSTREAM_CACHE_MAX_ENTRIES,
+        backend: Optional[PostgresCacheBackend] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.backend = backend
+
+        # key -> (monotonic expiry, value), oldest first
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached value, or fetch it once for all concurrent callers"""
+        value = self._get_local(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield so one cancelled client doesn't cancel the fetch for the rest
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if self.backend is not None:
+            try:
+                shared = await asyncio.to_thread(self.backend.get, key)
+            except Exception as e:
+                print(f"Error reading shared cache: {e}")
+                shared = None
+            if shared is not None:
+                value, expires_at = shared
+                ttl = (expires_at - datetime.utcnow()).total_seconds()
+                self._set_local(key, value, ttl)
+                return value
+
+        value = await fetch()
+
+        # Sources swallow their errors and return [], don't pin those
+        if not value:
+            return value
+
+        self._set_local(key, value, self.ttl_seconds)
+        if self.backend is not None:
+            expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+            try:
+                await asyncio.to_thread(self.backend.set, key, value, expires_at)
+            except Exception as e:
+                print(f"Error writing shared cache: {e}")
+
+        return value
+
+    def _get_local(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any, ttl_seconds: float):
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        # Evict least recently used entries past the bound
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+
+def create_upstream_cache() -> UpstreamCache:
+    """Build the cache configured by UPSTREAM_CACHE_BACKEND"""
+    backend = PostgresCacheBackend() if UPSTREAM_CACHE_BACKEND == "postgres" else None
+    return UpstreamCache(backend=backend)
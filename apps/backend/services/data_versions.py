@@ -0,0 +1,40 @@
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.materials import DataVersion
+
+# How long a worker trusts the versions it last read, polls inside this
+# window are answered without touching the database
+DATA_VERSION_TTL_SECONDS = float(os.getenv("DATA_VERSION_TTL_SECONDS", "2"))
+
+# Before migration 0005 has seeded a row
+UNVERSIONED = (0, datetime(1970, 1, 1))
+
+
+class DataVersions:
+    """Per-worker copy of the trigger-maintained data_versions table"""
+
+    def __init__(self, ttl_seconds: float = DATA_VERSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._versions: Dict[str, Tuple[int, datetime]] = {}
+        self._read_at: Optional[float] = None
+
+    async def get(self, db: AsyncSession, table: str) -> Tuple[int, datetime]:
+        """(version, last change in UTC) for a table, reading all versions when the copy is stale"""
+        if self._read_at is None or time.monotonic() - self._read_at >= self.ttl_seconds:
+            rows = (await db.execute(select(DataVersion.table_name, DataVersion.version, DataVersion.updated_at))).all()
+            self._versions = {name: (version, updated_at) for name, version, updated_at in rows}
+            self._read_at = time.monotonic()
+        return self._versions.get(table, UNVERSIONED)
+
+    def invalidate(self):
+        """Re-read on the next request, e.g. right after this worker wrote papers"""
+        self._read_at = None
+
+
+data_versions = DataVersions()
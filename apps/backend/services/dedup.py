@@ -0,0 +1,257 @@
+import os
+import re
+import unicodedata
+import zlib
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .records import PaperRecord
+
+# Dedup settings from environment
+DEDUP_TITLE_THRESHOLD = float(os.getenv("DEDUP_TITLE_THRESHOLD", "0.8"))  # Jaccard over title shingles
+
+# 8 bands x 4 rows: titles at 0.8 similarity become candidates ~98% of the time
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+SHINGLE_SIZE = 4
+
+# Busy LSH buckets (e.g. "Editorial") only compare against their first few groups
+MAX_BUCKET_CANDIDATES = 20
+
+# Fields a merged record borrows from its duplicates when the primary lacks them
+FILL_FIELDS = ["doi", "arxiv_id", "pmc_id", "abstract", "authors", "pdf_url", "url", "published_at"]
+
+DOI_PATTERN = re.compile(r"10\.\d{4,9}/\S+")
+ARXIV_PATTERN = re.compile(r"(\d{4}\.\d{4,5}|[a-z][a-z\-]*(?:\.[a-z]{2})?/\d{7})(?:v\d+)?$", re.IGNORECASE)
+
+SIGNATURE_SIZE = MINHASH_BANDS * MINHASH_ROWS
+
+
+def normalize_doi(value: Optional[str]) -> Optional[str]:
+    """Bare lowercase DOI from "doi: 10.x/..", doi.org URLs and the like, None if there isn't one"""
+    if not value:
+        return None
+    match = DOI_PATTERN.search(value.strip().lower())
+    if not match:
+        return None
+    return match.group().rstrip(".,;") or None
+
+
+def normalize_arxiv_id(value: Optional[str]) -> Optional[str]:
+    """arXiv ID without prefix, URL or version, e.g. "2401.01234" or "cond-mat/0102536" """
+    if not value:
+        return None
+    value = value.strip()
+    value = re.sub(r"^(arxiv:|https?://(export\.)?arxiv\.org/(abs|pdf)/)", "", value, flags=re.IGNORECASE)
+    value = re.sub(r"\.pdf$", "", value)
+    match = ARXIV_PATTERN.search(value)
+    return match.group(1).lower() if match else None
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """Lowercase ASCII words of a title, for exact and fuzzy comparison"""
+    if not title:
+        return ""
+    title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    # Strip markup some sources leave in titles (<i>, $...$)
+    title = re.sub(r"<[^>]+>|\$", " ", title.lower())
+    return " ".join(re.findall(r"[a-z0-9]+", title))
+
+
+def first_author_key(authors: Optional[List[str]]) -> str:
+    """Surname of the first author across "John Smith", "Smith, John" and PMC's "Smith J" """
+    if not authors:
+        return ""
+    name = unicodedata.normalize("NFKD", authors[0]).encode("ascii", "ignore").decode().strip()
+    if "," in name:
+        surname = name.split(",", 1)[0]
+    else:
+        parts = name.split()
+        if not parts:
+            return ""
+        # "Smith JA" puts initials last
+        surname = parts[0] if len(parts) > 1 and parts[-1].isupper() and len(parts[-1]) <= 3 else parts[-1]
+    return re.sub(r"[^a-z]", "", surname.lower())
+
+
+def title_shingles(normalized_title: str) -> Set[str]:
+    if len(normalized_title) <= SHINGLE_SIZE:
+        return {normalized_title} if normalized_title else set()
+    return {normalized_title[i:i + SHINGLE_SIZE] for i in range(len(normalized_title) - SHINGLE_SIZE + 1)}
+
+
+def minhash_bands(shingles: Set[str]) -> List[Tuple[int, ...]]:
+    """One-permutation MinHash signature of a shingle set, split into LSH band keys"""
+    # Each shingle hash lands in one bin and the bin keeps its minimum, so
+    # the signature costs one pass over the shingles instead of one per row
+    signature: List[Optional[int]] = [None] * SIGNATURE_SIZE
+    for shingle in shingles:
+        h = zlib.crc32(shingle.encode())
+        slot, value = h % SIGNATURE_SIZE, h // SIGNATURE_SIZE
+        if signature[slot] is None or value < signature[slot]:
+            signature[slot] = value
+
+    # Densify short titles: an empty bin borrows the next filled bin's value,
+    # offset by the distance so borrowed values stay distinguishable
+    filled = [slot for slot, value in enumerate(signature) if value is not None]
+    if filled and len(filled) < SIGNATURE_SIZE:
+        for slot in range(SIGNATURE_SIZE):
+            if signature[slot] is None:
+                distance = 1
+                while signature[(slot + distance) % SIGNATURE_SIZE] is None:
+                    distance += 1
+                signature[slot] = -(signature[(slot + distance) % SIGNATURE_SIZE] + distance * (1 << 32))
+
+    return [
+        (band,) + tuple(signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+        for band in range(MINHASH_BANDS)
+    ]
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Group:
+    """One deduplicated paper and the records merged into it"""
+
+    __slots__ = ("records", "dois", "arxiv_ids", "shingles", "author")
+
+    def __init__(self, record: PaperRecord, doi: Optional[str], arxiv_id: Optional[str], shingles: Set[str], author: str):
+        self.records = [record]
+        self.dois = {doi} if doi else set()
+        self.arxiv_ids = {arxiv_id} if arxiv_id else set()
+        self.shingles = shingles
+        self.author = author
+
+
+class PaperDeduplicator:
+    """Incremental cross-source dedup on DOI, arXiv ID, then title + first author similarity"""
+
+    def __init__(self, title_threshold: float = DEDUP_TITLE_THRESHOLD):
+        self.title_threshold = title_threshold
+        self.groups: List[_Group] = []
+        self._by_doi: Dict[str, int] = {}
+        self._by_arxiv_id: Dict[str, int] = {}
+        self._by_title: Dict[Tuple[str, str], int] = {}
+        self._buckets: Dict[Tuple[int, ...], List[int]] = {}
+
+    def add(self, paper: PaperRecord) -> Tuple[int, bool]:
+        """Add one paper, returning (group index, whether it started a new group)"""
+        doi = normalize_doi(paper.doi)
+        arxiv_id = normalize_arxiv_id(paper.arxiv_id)
+        title = normalize_title(paper.title)
+        author = first_author_key(paper.authors)
+
+        # Identifier matches are exact, checked before any similarity work
+        group = self._by_doi.get(doi) if doi else None
+        if group is None and arxiv_id:
+            group = self._by_arxiv_id.get(arxiv_id)
+        if group is None and title:
+            group = self._by_title.get((title, author))
+            if group is not None and not self._compatible(group, author, doi, arxiv_id):
+                group = None
+
+        shingles = None
+        bands = None
+        if group is None and title:
+            shingles = title_shingles(title)
+            bands = minhash_bands(shingles)
+            group = self._similar_group(bands, shingles, author, doi, arxiv_id)
+
+        if group is not None:
+            self._merge_into(group, paper, doi, arxiv_id)
+            return group, False
+
+        if shingles is None:
+            shingles = title_shingles(title)
+            bands = minhash_bands(shingles) if title else []
+
+        group = len(self.groups)
+        self.groups.append(_Group(paper, doi, arxiv_id, shingles, author))
+        if doi:
+            self._by_doi[doi] = group
+        if arxiv_id:
+            self._by_arxiv_id[arxiv_id] = group
+        if title:
+            self._by_title.setdefault((title, author), group)
+        for band in bands:
+            self._buckets.setdefault(band, []).append(group)
+
+        return group, True
+
+    def _similar_group(self, bands, shingles: Set[str], author: str, doi: Optional[str], arxiv_id: Optional[str]) -> Optional[int]:
+        checked = set()
+        for band in bands:
+            for group in self._buckets.get(band, ())[:MAX_BUCKET_CANDIDATES]:
+                if group in checked:
+                    continue
+                checked.add(group)
+
+                if self._compatible(group, author, doi, arxiv_id) and _jaccard(shingles, self.groups[group].shingles) >= self.title_threshold:
+                    return group
+        return None
+
+    def _compatible(self, group: int, author: str, doi: Optional[str], arxiv_id: Optional[str]) -> bool:
+        candidate = self.groups[group]
+        if author and candidate.author and author != candidate.author:
+            return False
+        # Different DOIs or arXiv IDs are different papers, however alike the titles
+        if doi and candidate.dois and doi not in candidate.dois:
+            return False
+        if arxiv_id and candidate.arxiv_ids and arxiv_id not in candidate.arxiv_ids:
+            return False
+        return True
+
+    def _merge_into(self, group: int, paper: PaperRecord, doi: Optional[str], arxiv_id: Optional[str]):
+        entry = self.groups[group]
+        entry.records.append(paper)
+        if doi and doi not in entry.dois:
+            entry.dois.add(doi)
+            self._by_doi.setdefault(doi, group)
+        if arxiv_id and arxiv_id not in entry.arxiv_ids:
+            entry.arxiv_ids.add(arxiv_id)
+            self._by_arxiv_id.setdefault(arxiv_id, group)
+
+    def merged(self, group: int) -> PaperRecord:
+        """One record for a group, the first paper filled in from the rest, with provenance"""
+        records = self.groups[group].records
+        fills: Dict[str, Any] = {}
+        for record in records[1:]:
+            for field in FILL_FIELDS:
+                if not (fills.get(field) or getattr(records[0], field)) and getattr(record, field):
+                    fills[field] = getattr(record, field)
+            for field in ("keywords", "materials_focus"):
+                if getattr(record, field):
+                    current = fills.get(field, getattr(records[0], field)) or []
+                    fills[field] = list(dict.fromkeys(current + getattr(record, field)))
+
+        # A copy, the grouped records may be shared with the upstream cache
+        merged = replace(records[0], **fills)
+        merged.doi = normalize_doi(merged.doi)
+        merged.arxiv_id = normalize_arxiv_id(merged.arxiv_id)
+        merged.sources = list(dict.fromkeys(record.source for record in records if record.source))
+        merged.provenance = [
+            {
+                "source": record.source,
+                "doi": normalize_doi(record.doi),
+                "arxiv_id": normalize_arxiv_id(record.arxiv_id),
+                "pmc_id": record.pmc_id,
+                "url": record.url,
+            }
+            for record in records
+        ]
+        return merged
+
+    def results(self) -> List[PaperRecord]:
+        return [self.merged(group) for group in range(len(self.groups))]
+
+
+def deduplicate_papers(papers: List[PaperRecord]) -> List[PaperRecord]:
+    """Merge duplicate papers, earlier papers win; each keeps its source in provenance"""
+    deduplicator = PaperDeduplicator()
+    for paper in papers:
+        deduplicator.add(paper)
+    return deduplicator.results()
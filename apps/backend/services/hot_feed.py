@@ -0,0 +1,335 @@
+import asyncio
+import heapq
+import os
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.materials import ResearchPaper, StatsSummary
+from .data_versions import data_versions
+from .metrics import HOT_FEED_LOOKUPS
+
+# Serve the newest papers listings from memory
+HOT_FEED_ENABLED = os.getenv("HOT_FEED_ENABLED", "true").lower() == "true"
+# Papers kept per feed (all papers, each materials focus, each tracked
+# journal), two pages at the largest page size
+HOT_FEED_SIZE = int(os.getenv("HOT_FEED_SIZE", "200"))
+# Journals with a feed of their own, the ones with the most papers
+HOT_FEED_JOURNALS = int(os.getenv("HOT_FEED_JOURNALS", "50"))
+# Changes are applied incrementally, with a full reload at most this often
+# to drop papers that have aged out of every feed
+HOT_FEED_REBUILD_SECONDS = float(os.getenv("HOT_FEED_REBUILD_SECONDS", "3600"))
+# Changed rows folded in per refresh, more (a big ingest) reload the feeds instead
+HOT_FEED_MAX_CHANGES = int(os.getenv("HOT_FEED_MAX_CHANGES", "1000"))
+# After a failed refresh the database answers for this long before the next try
+HOT_FEED_RETRY_SECONDS = float(os.getenv("HOT_FEED_RETRY_SECONDS", "30"))
+
+# Changed rows are re-read from this long before the last refresh, a write's
+# updated_at is its transaction start and it may commit after we looked
+CHANGE_OVERLAP = timedelta(minutes=5)
+
+PaperKey = Tuple[datetime, int]
+
+
+def sort_key(paper: dict) -> PaperKey:
+    """Position of a paper in the (published_at, id) order the listings use"""
+    return paper["published_at"], paper["id"]
+
+
+class FeedBuffer:
+    """Newest papers of one feed, oldest first, missing none newer than its oldest entry"""
+
+    def __init__(self, papers: Sequence[dict], size: int):
+        self.size = size
+        self.papers = sorted(papers, key=sort_key)
+        # Fewer than a full buffer means the feed has no older papers
+        self.complete = len(self.papers) < size
+
+    def add(self, paper: dict):
+        # Below the oldest entry of a partial feed there may be papers we never loaded
+        if not self.complete and (not self.papers or sort_key(paper) < sort_key(self.papers[0])):
+            return
+        insort(self.papers, paper, key=sort_key)
+        if len(self.papers) > self.size:
+            del self.papers[0]
+            self.complete = False
+
+    def remove(self, paper: dict):
+        index = bisect_left(self.papers, sort_key(paper), key=sort_key)
+        if index < len(self.papers) and self.papers[index]["id"] == paper["id"]:
+            del self.papers[index]
+
+
+def known_papers(
+    buffers: Sequence[FeedBuffer],
+    where: Optional[Callable[[dict], bool]] = None,
+    since: Optional[datetime] = None,
+) -> Optional[Tuple[List[dict], bool]]:
+    """Matching papers of the merged feeds, oldest first, cut where one could be missing, and whether that is all of them"""
+    partial = [buffer for buffer in buffers if not buffer.complete]
+    if any(not buffer.papers for buffer in partial):
+        return None
+    # Each partial feed only vouches for papers down to its oldest entry
+    horizon = max((sort_key(buffer.papers[0]) for buffer in partial), default=None)
+    complete = horizon is None or (since is not None and horizon < (since,))
+
+    if len(buffers) == 1 and where is None and since is None:
+        return buffers[0].papers, complete
+
+    papers = heapq.merge(*(buffer.papers for buffer in buffers), key=sort_key)
+    return [
+        paper for paper in papers
+        if (horizon is None or sort_key(paper) >= horizon)
+        and (since is None or paper["published_at"] >= since)
+        and (where is None or where(paper))
+    ], complete
+
+
+def newest_page(
+    papers: List[dict],
+    complete: bool,
+    limit: int,
+    offset: int = 0,
+    after: Optional[PaperKey] = None,
+) -> Optional[Tuple[List[dict], bool]]:
+    """(page newest first, whether more follow) from known_papers, None when it runs past them"""
+    end = bisect_left(papers, after, key=sort_key) if after else len(papers) - offset
+    # One extra paper tells whether another page exists
+    start = end - limit - 1
+    if start < 0 and not complete:
+        return None
+    page = papers[max(start, 0):max(end, 0)][::-1]
+    return page[:limit], len(page) > limit
+
+
+class HotFeed:
+    """Per-worker snapshot of the newest papers overall, per materials focus and per journal"""
+
+    def __init__(
+        self,
+        columns: Sequence,
+        size: int = HOT_FEED_SIZE,
+        journals: int = HOT_FEED_JOURNALS,
+        enabled: bool = HOT_FEED_ENABLED,
+    ):
+        self.columns = list(columns)
+        self.size = size
+        self.journals = journals
+        self.enabled = enabled
+        self.version: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.newest = FeedBuffer([], self.size)
+        self.by_focus: Dict[str, FeedBuffer] = {}
+        self.by_journal: Dict[str, FeedBuffer] = {}
+        self.papers: Dict[int, dict] = {}
+        self.total = 0
+        self.focus_counts: Dict[str, int] = {}
+        self.journal_counts: Dict[str, int] = {}
+        self.max_id = 0
+        self.checked_at: Optional[datetime] = None
+        self.built_at = 0.0
+        self.retry_at = 0.0
+
+    async def page(
+        self,
+        db: AsyncSession,
+        limit: int,
+        offset: int = 0,
+        after: Optional[PaperKey] = None,
+        journal: Optional[str] = None,
+        materials_focus: Optional[str] = None,
+    ) -> Optional[Tuple[List[dict], bool, int]]:
+        """(papers newest first, whether more follow, total) for a /papers listing, None when only the database can answer"""
+        if not await self._ready(db):
+            return self._lookup(None)
+
+        feed = self._filtered(journal, materials_focus)
+        if feed is None:
+            return self._lookup(None)
+        papers, complete, total = feed
+
+        page = newest_page(papers, complete, limit, offset, after)
+        if page is None or (total is None and not complete):
+            return self._lookup(None)
+        return self._lookup((page[0], page[1], len(papers) if total is None else total))
+
+    async def recent(self, db: AsyncSession, since: datetime, limit: int) -> Optional[List[dict]]:
+        """Newest papers published since a date, None when only the database can answer"""
+        if not await self._ready(db):
+            return self._lookup(None)
+
+        known = known_papers([self.newest], since=since)
+        page = known and newest_page(*known, limit)
+        return self._lookup(page and page[0])
+
+    def _filtered(
+        self, journal: Optional[str], materials_focus: Optional[str]
+    ) -> Optional[Tuple[List[dict], bool, Optional[int]]]:
+        """(known papers, complete, total or None to count them) for a listing's filters"""
+        if not journal and not materials_focus:
+            known = known_papers([self.newest])
+            return known and (*known, self.total)
+
+        if journal:
+            # Matches journal ILIKE '%...%' only for plain ASCII text
+            needle = journal.lower()
+            if not needle.isascii() or any(char in needle for char in "%_\\"):
+                return None
+            journals = [name for name in self.journal_counts if needle in name.lower()]
+
+        if materials_focus:
+            # A focus nobody has tagged yet is an empty, complete feed
+            buffer = self.by_focus.get(materials_focus, FeedBuffer([], self.size))
+            if not journal:
+                known = known_papers([buffer])
+                return known and (*known, self.focus_counts.get(materials_focus, 0))
+            matches = set(journals)
+            known = known_papers([buffer], where=lambda paper: paper["journal"] in matches)
+            return known and (*known, None)
+
+        if any(name not in self.by_journal for name in journals):
+            return None
+        known = known_papers([self.by_journal[name] for name in journals])
+        return known and (*known, sum(self.journal_counts[name] for name in journals))
+
+    def _lookup(self, result):
+        HOT_FEED_LOOKUPS.labels("hit" if result is not None else "miss").inc()
+        return result
+
+    async def _ready(self, db: AsyncSession) -> bool:
+        """Whether the snapshot matches the current research_papers version, refreshing it if not"""
+        if not self.enabled:
+            return False
+        version, _ = await data_versions.get(db, "research_papers")
+        if version == self.version:
+            return True
+        # Another request is already refreshing, or the last try failed recently;
+        # the database answers meanwhile
+        if self._lock.locked() or time.monotonic() < self.retry_at:
+            return False
+
+        async with self._lock:
+            try:
+                await self.refresh(db, version)
+            except Exception as e:
+                print(f"Error refreshing hot feed, retrying in {HOT_FEED_RETRY_SECONDS:g}s: {e}")
+                self.retry_at = time.monotonic() + HOT_FEED_RETRY_SECONDS
+                await db.rollback()
+                return False
+        return True
+
+    async def refresh(self, db: AsyncSession, version: int):
+        """Bring the snapshot up to a data version, loading only the changed rows where possible"""
+        if self.version is None or version < self.version or time.monotonic() - self.built_at >= HOT_FEED_REBUILD_SECONDS:
+            await self._build(db)
+        elif not await self._apply_changes(db):
+            # Rows were deleted, which the changed rows cannot show, or too many changed
+            await self._build(db)
+        self.version = version
+
+    async def warm(self, sessions: Callable[[], AsyncSession]):
+        """Build the snapshot at startup so the first requests are served from memory"""
+        if not self.enabled:
+            return
+        try:
+            async with sessions() as db:
+                version, _ = await data_versions.get(db, "research_papers")
+                async with self._lock:
+                    await self.refresh(db, version)
+            print(f"Hot feed warmed: {len(self.papers)} papers, {len(self.by_focus)} focus and {len(self.by_journal)} journal feeds")
+        except Exception as e:
+            print(f"Error warming hot feed: {e}")
+
+    async def _build(self, db: AsyncSession):
+        checked_at = await self._now(db)
+        total, focus_counts, journal_counts = await self._read_counts(db)
+        papers: Dict[int, dict] = {}
+
+        async def load(condition=None) -> FeedBuffer:
+            stmt = select(*self.columns).order_by(ResearchPaper.published_at.desc(), ResearchPaper.id.desc()).limit(self.size)
+            if condition is not None:
+                stmt = stmt.where(condition)
+            # Papers in several feeds are held once
+            rows = (await db.execute(stmt)).all()
+            return FeedBuffer([papers.setdefault(row.id, dict(row._mapping)) for row in rows], self.size)
+
+        newest = await load()
+        by_focus = {focus: await load(ResearchPaper.materials_focus.contains([focus])) for focus in focus_counts}
+        tracked = sorted(journal_counts, key=journal_counts.get, reverse=True)[:self.journals]
+        by_journal = {name: await load(ResearchPaper.journal == name) for name in tracked}
+        max_id = (await db.execute(select(func.max(ResearchPaper.id)))).scalar() or 0
+
+        # Swapped in together, readers never await in between
+        self._reset()
+        self.newest, self.by_focus, self.by_journal, self.papers = newest, by_focus, by_journal, papers
+        self.total, self.focus_counts, self.journal_counts = total, focus_counts, journal_counts
+        self.max_id, self.checked_at, self.built_at = max_id, checked_at, time.monotonic()
+
+    async def _apply_changes(self, db: AsyncSession) -> bool:
+        """Fold rows changed since the last refresh into the feeds, False if any were deleted or there are too many"""
+        checked_at = await self._now(db)
+        rows = (await db.execute(
+            select(*self.columns)
+            .where(ResearchPaper.updated_at >= self.checked_at - CHANGE_OVERLAP)
+            .limit(HOT_FEED_MAX_CHANGES + 1)
+        )).all()
+        if len(rows) > HOT_FEED_MAX_CHANGES:
+            return False
+        total, focus_counts, journal_counts = await self._read_counts(db)
+
+        changed = [dict(row._mapping) for row in rows]
+        added = sum(1 for paper in changed if paper["id"] > self.max_id)
+        if total != self.total + added:
+            return False
+
+        for paper in changed:
+            old = self.papers.get(paper["id"])
+            if old is not None:
+                for buffer in self._feeds_of(old):
+                    buffer.remove(old)
+            for buffer in self._feeds_of(paper, create=True):
+                buffer.add(paper)
+
+        # Only papers some feed still holds, changed rows that went into none and
+        # papers pushed out of their feeds are dropped
+        feeds = [self.newest, *self.by_focus.values(), *self.by_journal.values()]
+        self.papers = {paper["id"]: paper for buffer in feeds for paper in buffer.papers}
+
+        self.total, self.focus_counts, self.journal_counts = total, focus_counts, journal_counts
+        self.max_id = max([self.max_id, *(paper["id"] for paper in changed)])
+        self.checked_at = checked_at
+        return True
+
+    def _feeds_of(self, paper: dict, create: bool = False) -> List[FeedBuffer]:
+        feeds = [self.newest]
+        for focus in set(paper["materials_focus"] or []):
+            # A focus first seen since the build has no older papers
+            if create and focus not in self.by_focus:
+                self.by_focus[focus] = FeedBuffer([], self.size)
+            if focus in self.by_focus:
+                feeds.append(self.by_focus[focus])
+        if paper["journal"] in self.by_journal:
+            feeds.append(self.by_journal[paper["journal"]])
+        return feeds
+
+    async def _now(self, db: AsyncSession) -> datetime:
+        # Database clock, in the naive form updated_at is stored in
+        return (await db.execute(select(func.localtimestamp()))).scalar()
+
+    async def _read_counts(self, db: AsyncSession) -> Tuple[int, Dict[str, int], Dict[str, int]]:
+        """Paper totals overall, per focus and per journal from the trigger-maintained summary"""
+        rows = (await db.execute(
+            select(StatsSummary.metric, StatsSummary.key, StatsSummary.count)
+            .where(StatsSummary.metric.in_(("papers_total", "papers_focus", "papers_journal")), StatsSummary.count > 0)
+        )).all()
+        counts: Dict[str, Dict[str, int]] = {"papers_total": {}, "papers_focus": {}, "papers_journal": {}}
+        for metric, key, count in rows:
+            counts[metric][key] = count
+        return counts["papers_total"].get("", 0), counts["papers_focus"], counts["papers_journal"]
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .metrics import UPSTREAM_REQUEST_SECONDS, UPSTREAM_REQUESTS, add_timing
+from .scheduler import (
+    RETRY_STATUSES,
+    UPSTREAM_MAX_RETRIES,
+    UPSTREAM_RATE_LIMITS,
+    UPSTREAM_RETRY_BASE_SECONDS,
+    ProviderScheduler,
+    create_schedulers,
+    retry_after_seconds,
+    retry_delay,
+)
+
+# Upstream HTTP settings from environment
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "true").lower() == "true"
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "50"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY_SECONDS", "60"))
+UPSTREAM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT_SECONDS", "5"))
+UPSTREAM_READ_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_READ_TIMEOUT_SECONDS", "30"))
+
+# Concurrent requests per host, NCBI allows about 3 requests/s without an
+# API key and ArXiv asks for one connection at a time
+UPSTREAM_HOST_LIMITS = {
+    host.strip(): int(limit)
+    for host, limit in (
+        item.split("=", 1)
+        for item in os.getenv(
+            "UPSTREAM_HOST_LIMITS", "eutils.ncbi.nlm.nih.gov=3,doaj.org=5,export.arxiv.org=1"
+        ).split(",")
+        if "=" in item
+    )
+}
+
+USER_AGENT = "MaSOT/1.0 (materials science aggregator)"
+
+
+class UpstreamActivity:
+    """Requests of one source call waiting for their turn and on the wire right now"""
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+
+    @property
+    def only_queued(self) -> bool:
+        """Waiting on this process's own pacing, with nothing sent to the upstream"""
+        return self.queued > 0 and self.in_flight == 0
+
+
+# Set by a caller, e.g. the source executor, to see where its requests are
+upstream_activity: ContextVar[Optional[UpstreamActivity]] = ContextVar("upstream_activity", default=None)
+
+
+@contextmanager
+def tracked(state: str) -> Iterator[None]:
+    """Count a request as queued or in flight for the current source call"""
+    activity = upstream_activity.get()
+    if activity is None:
+        yield
+        return
+    setattr(activity, state, getattr(activity, state) + 1)
+    try:
+        yield
+    finally:
+        setattr(activity, state, getattr(activity, state) - 1)
+
+
+class UpstreamHTTP:
+    """One pooled HTTP/2 client shared by every source service, with per-host pacing and concurrency caps"""
+
+    def __init__(
+        self,
+        host_limits: Optional[Dict[str, int]] = None,
+        rate_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        http2: bool = UPSTREAM_HTTP2,
+        max_retries: int = UPSTREAM_MAX_RETRIES,
+        retry_base_seconds: float = UPSTREAM_RETRY_BASE_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.host_limits = dict(UPSTREAM_HOST_LIMITS if host_limits is None else host_limits)
+        self.schedulers = create_schedulers(UPSTREAM_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.http2 = http2
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def start(self):
+        """Open the shared client, called from the app lifespan"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=UPSTREAM_MAX_CONNECTIONS,
+                    max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                timeout=httpx.Timeout(UPSTREAM_READ_TIMEOUT_SECONDS, connect=UPSTREAM_CONNECT_TIMEOUT_SECONDS),
+                headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+                follow_redirects=True,
+                transport=self.transport,
+            )
+
+    async def close(self):
+        """Close pooled connections, a later request opens a fresh client"""
+        # Semaphores belong to the loop that used them, start over with the next client
+        self._semaphores.clear()
+        for scheduler in self.schedulers.values():
+            scheduler.reset_loop_state()
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("UpstreamHTTP is not started")
+        return self._client
+
+    def _host_slot(self, url: str) -> Optional[asyncio.Semaphore]:
+        host = urlsplit(url).hostname or ""
+        limit = self.host_limits.get(host)
+        if limit is None:
+            return None
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(limit)
+        return semaphore
+
+    @asynccontextmanager
+    async def _host_turn(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the host's concurrent request slots, if it is capped"""
+        semaphore = self._host_slot(url)
+        if semaphore is None:
+            yield
+            return
+        with tracked("queued"):
+            await semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    async def _send(self, scheduler: Optional[ProviderScheduler], method: str, url: str, **kwargs) -> httpx.Response:
+        """Send once the provider's scheduler allows, retrying 429 and 5xx with backoff"""
+        request = self.client.build_request(method, url, **kwargs)
+        host = request.url.host
+        attempt = 0
+        while True:
+            if scheduler is not None:
+                with tracked("queued"):
+                    await scheduler.acquire()
+            started = time.perf_counter()
+            try:
+                with tracked("in_flight"):
+                    response = await self.client.send(request, stream=True)
+            except httpx.HTTPError:
+                UPSTREAM_REQUESTS.labels(host, "error").inc()
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                UPSTREAM_REQUEST_SECONDS.labels(host).observe(elapsed)
+                add_timing("upstream", elapsed)
+            UPSTREAM_REQUESTS.labels(host, str(response.status_code)).inc()
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+
+            await response.aclose()
+            retry_after = retry_after_seconds(response)
+            if scheduler is not None:
+                scheduler.record_retry(response.status_code, retry_after)
+            await asyncio.sleep(retry_delay(attempt, retry_after, self.retry_base_seconds))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET under the host's rate limit and concurrency cap"""
+        async with self.stream("GET", url, **kwargs) as response:
+            await response.aread()
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Streamed request, holding the host slot until the body is consumed"""
+        # Scripts and tests that skip the lifespan get a client on first use
+        await self.start()
+        scheduler = self.schedulers.get(urlsplit(url).hostname or "")
+        async with self._host_turn(url):
+            response = await self._send(scheduler, method, url, **kwargs)
+            try:
+                # Reading the body is still waiting on the upstream
+                with tracked("in_flight"):
+                    yield response
+            finally:
+                await response.aclose()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, wait time and retry counters per paced host"""
+        return {host: scheduler.metrics() for host, scheduler in self.schedulers.items()}
+
+
+# Shared instance, started and closed by the app lifespan
+upstream_http = UpstreamHTTP()
@@ -0,0 +1,393 @@
+import asyncio
+import os
+import sys
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy import literal_column, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import func
+
+from models.database import SessionLocal
+from models.materials import FetchWatermark, ResearchPaper, SourceWatermark
+from .arxiv_service import ArxivService
+from .dedup import deduplicate_papers, normalize_arxiv_id, normalize_doi
+from .multi_source_service import MultiSourceService
+from .data_versions import data_versions
+from .records import PaperRecord
+from .tagging import materials_tagger
+
+# Ingestion settings from environment
+INGESTION_ENABLED = os.getenv("INGESTION_ENABLED", "true").lower() == "true"
+INGESTION_INTERVAL_MINUTES = int(os.getenv("INGESTION_INTERVAL_MINUTES", "60"))
+INGESTION_BATCH_SIZE = int(os.getenv("INGESTION_BATCH_SIZE", "200"))
+RETAG_BATCH_SIZE = int(os.getenv("RETAG_BATCH_SIZE", "1000"))
+INGESTION_MAX_RESULTS = int(os.getenv("INGESTION_MAX_RESULTS", "100"))
+# Pages of INGESTION_MAX_RESULTS one window is walked through before the pass
+# gives up on it, leaving its watermark for the next pass
+INGESTION_MAX_PAGES = int(os.getenv("INGESTION_MAX_PAGES", "50"))
+INGESTION_QUERY = os.getenv("INGESTION_QUERY", "materials science")
+# First run looks this far back, later runs start where the last window
+# ended minus the overlap, which covers ArXiv's announcement lag and the
+# day precision of PMC and DOAJ dates
+INGESTION_INITIAL_DAYS_BACK = int(os.getenv("INGESTION_INITIAL_DAYS_BACK", "7"))
+INGESTION_WINDOW_OVERLAP_HOURS = float(os.getenv("INGESTION_WINDOW_OVERLAP_HOURS", "48"))
+INGESTION_SOURCES = [
+    source.strip()
+    for source in os.getenv("INGESTION_SOURCES", "arxiv,pubmed_central,doaj").split(",")
+    if source.strip()
+]
+
+# Arbitrary key so only one worker process ingests at a time
+INGESTION_LOCK_KEY = 7_301_001
+
+# Columns refreshed when an upsert hits an existing row
+UPSERT_COLUMNS = [
+    "title", "authors", "abstract", "journal", "published_at", "doi", "arxiv_id",
+    "keywords", "materials_focus", "pdf_url", "sources",
+]
+
+def normalize_query(query: str) -> str:
+    """Lowercase, whitespace-collapsed query used to key fetch watermarks"""
+    return " ".join(query.lower().split())
+
+
+def _truncate(value: Optional[str], length: int) -> Optional[str]:
+    """Trim a string to its column length, mapping empty strings to None"""
+    if not value:
+        return None
+    return value[:length]
+
+
+class IngestionService:
+    def __init__(
+        self,
+        arxiv_service: Optional[ArxivService] = None,
+        multi_source_service: Optional[MultiSourceService] = None,
+    ):
+        self.arxiv_service = arxiv_service or ArxivService()
+        self.multi_source_service = multi_source_service or MultiSourceService()
+        self._task: Optional[asyncio.Task] = None
+
+    def source_query(self, source: str) -> str:
+        """Query a source is ingested with, which keys its fetch watermark"""
+        if source == "arxiv":
+            return normalize_query(self.arxiv_service.build_search_query(days_back=None))
+        return normalize_query(INGESTION_QUERY)
+
+    async def fetch_source(
+        self,
+        source: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Fetch one page of a source's papers added in the window, raising on upstream errors"""
+        if source == "arxiv":
+            return await self.arxiv_service.search_materials_papers(INGESTION_MAX_RESULTS, since=since, until=until, offset=offset)
+        # Any other registered adapter is searched with INGESTION_QUERY
+        return await self.multi_source_service.fetch_guarded(source, INGESTION_QUERY, INGESTION_MAX_RESULTS, since, until, offset)
+
+    async def fetch_window(self, source: str, since: datetime, until: datetime) -> Tuple[List[PaperRecord], bool]:
+        """Page through a source's window until a short page, returning its papers and whether it was all fetched"""
+        papers = []
+        for page in range(INGESTION_MAX_PAGES):
+            # Newest first, so papers added mid-walk push results onto the next
+            # page, where they are fetched twice rather than missed
+            batch = await self.fetch_source(source, since, until, offset=page * INGESTION_MAX_RESULTS)
+            papers.extend(batch)
+            if len(batch) < INGESTION_MAX_RESULTS:
+                return papers, True
+        return papers, False
+
+    def fetch_window_start(self, source: str, query: str, until: datetime) -> datetime:
+        """Start of the next window: the last complete window's end less the overlap"""
+        db = SessionLocal()
+        try:
+            watermark = db.get(FetchWatermark, (source, query))
+            if watermark is None or watermark.fetched_until is None:
+                return until - timedelta(days=INGESTION_INITIAL_DAYS_BACK)
+            return watermark.fetched_until - timedelta(hours=INGESTION_WINDOW_OVERLAP_HOURS)
+        finally:
+            db.close()
+
+    async def run_once(self) -> Dict[str, Dict[str, int]]:
+        """Run a single ingestion pass over every configured source"""
+        lock_db = SessionLocal()
+        acquired = False
+        try:
+            acquired = await asyncio.to_thread(self._try_lock, lock_db)
+            if not acquired:
+                print("Ingestion already running in another worker, skipping")
+                return {}
+
+            until = datetime.utcnow()
+            fetched = {}
+            windows = {}
+            for source in INGESTION_SOURCES:
+                try:
+                    query = self.source_query(source)
+                    since = await asyncio.to_thread(self.fetch_window_start, source, query, until)
+                    fetched[source], complete = await self.fetch_window(source, since, until)
+                except Exception as e:
+                    print(f"Error fetching {source} for ingestion: {e}")
+                    continue
+
+                # Pages come newest first, so a window cut off at INGESTION_MAX_PAGES
+                # is missing its oldest papers and keeps its watermark
+                if complete:
+                    windows[source] = (query, until)
+                else:
+                    print(f"{source} still had papers since {since:%Y-%m-%d %H:%M} after {INGESTION_MAX_PAGES} pages, "
+                          f"keeping its watermark")
+                    windows[source] = (query, None)
+
+            # Merge the same paper across sources before writing, each merged
+            # paper is written under the first source (in INGESTION_SOURCES order)
+            # that returned it
+            merged = await asyncio.to_thread(deduplicate_papers, [
+                replace(paper, source=source) for source, papers in fetched.items() for paper in papers
+            ])
+            by_source = {source: [] for source in fetched}
+            for paper in merged:
+                by_source[paper.sources[0]].append(paper)
+
+            results = {}
+            for source, papers in by_source.items():
+                try:
+                    query, fetched_until = windows[source]
+                    results[source] = await asyncio.to_thread(self.write_papers, source, papers, query, fetched_until)
+                    results[source]["fetched"] = len(fetched[source])
+                except Exception as e:
+                    print(f"Error ingesting from {source}: {e}")
+
+            return results
+
+        finally:
+            await asyncio.to_thread(self._unlock, lock_db, acquired)
+
+    def write_papers(
+        self,
+        source: str,
+        papers: List[PaperRecord],
+        query: Optional[str] = None,
+        fetched_until: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """Upsert papers newer than the source's high-water mark, advancing its fetch watermark"""
+        db = SessionLocal()
+        try:
+            watermark = db.get(SourceWatermark, source)
+            if watermark is None:
+                watermark = SourceWatermark(source=source)
+                db.add(watermark)
+
+            # Keep papers on the watermark itself, sources with day or month
+            # precision can publish more papers on the same date. A windowed
+            # fetch is already the delta, and late deposits of older papers
+            # there are new to us
+            rows = []
+            for paper in papers:
+                row = self._paper_to_row(paper)
+                if row is None:
+                    continue
+                if query is None and watermark.last_published_at and row["published_at"] < watermark.last_published_at:
+                    continue
+                rows.append(row)
+
+            upserted = 0
+            for start in range(0, len(rows), INGESTION_BATCH_SIZE):
+                upserted += self._upsert_batch(db, rows[start:start + INGESTION_BATCH_SIZE])
+
+            if rows:
+                newest = max(row["published_at"] for row in rows)
+                if not watermark.last_published_at or newest > watermark.last_published_at:
+                    watermark.last_published_at = newest
+            watermark.last_run_at = datetime.utcnow()
+
+            # Moves with the papers it covers, in the same transaction
+            if query is not None:
+                fetch_watermark = db.get(FetchWatermark, (source, query))
+                if fetch_watermark is None:
+                    fetch_watermark = FetchWatermark(source=source, query=query)
+                    db.add(fetch_watermark)
+                if fetched_until is not None:
+                    fetch_watermark.fetched_until = fetched_until
+                fetch_watermark.last_run_at = datetime.utcnow()
+
+            db.commit()
+            # This worker's conditional GETs and hot feed see the new papers
+            # at once, others within DATA_VERSION_TTL_SECONDS
+            data_versions.invalidate()
+
+            return {"fetched": len(papers), "new": len(rows), "upserted": upserted}
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _upsert_batch(self, db, rows: List[Dict[str, Any]]) -> int:
+        """Upsert a batch, keyed on arxiv_id when present and on doi otherwise"""
+        arxiv_rows = {row["arxiv_id"]: row for row in rows if row["arxiv_id"]}
+        doi_rows = {row["doi"]: row for row in rows if not row["arxiv_id"] and row["doi"]}
+
+        upserted = 0
+        for key, keyed_rows in (("arxiv_id", arxiv_rows), ("doi", doi_rows)):
+            if not keyed_rows:
+                continue
+
+            values = list(keyed_rows.values())
+            try:
+                with db.begin_nested():
+                    db.execute(self._upsert_statement(key, values))
+                upserted += len(values)
+            except IntegrityError:
+                # A row collided on the other unique column, retry one by one
+                # so only the offending rows are dropped
+                for value in values:
+                    try:
+                        with db.begin_nested():
+                            db.execute(self._upsert_statement(key, [value]))
+                        upserted += 1
+                    except IntegrityError as e:
+                        # An arXiv paper whose DOI is already stored from another
+                        # source merges into that row instead
+                        if key == "arxiv_id" and value["doi"]:
+                            try:
+                                with db.begin_nested():
+                                    db.execute(self._upsert_statement("doi", [value]))
+                                upserted += 1
+                                continue
+                            except IntegrityError:
+                                pass
+                        print(f"Skipping conflicting paper {value.get(key)}: {e.orig}")
+
+        return upserted
+
+    def _upsert_statement(self, key: str, values: List[Dict[str, Any]]):
+        """Build an INSERT ... ON CONFLICT (key) DO UPDATE statement"""
+        stmt = insert(ResearchPaper).values(values)
+        update_columns = {column: stmt.excluded[column] for column in UPSERT_COLUMNS if column != key}
+        # Never drop an identifier another source already filled in
+        for column in ("doi", "arxiv_id"):
+            if column in update_columns:
+                update_columns[column] = func.coalesce(stmt.excluded[column], getattr(ResearchPaper, column))
+        # Provenance accumulates across runs and sources
+        update_columns["sources"] = literal_column(
+            "ARRAY(SELECT DISTINCT unnest(coalesce(research_papers.sources, '{}') || coalesce(excluded.sources, '{}')))"
+        )
+        # Only rows something changed in are rewritten, so re-fetching a paper
+        # leaves updated_at and the table's data version (and ETags) alone
+        changed = [
+            getattr(ResearchPaper, column).is_distinct_from(value)
+            for column, value in update_columns.items() if column != "sources"
+        ]
+        changed.append(literal_column("NOT (coalesce(excluded.sources, '{}') <@ coalesce(research_papers.sources, '{}'))"))
+        update_columns["updated_at"] = func.now()
+        return stmt.on_conflict_do_update(index_elements=[key], set_=update_columns, where=or_(*changed))
+
+    def _paper_to_row(self, paper: PaperRecord) -> Optional[Dict[str, Any]]:
+        """Map a paper record onto research_papers columns"""
+        if not paper.title or paper.published_at is None:
+            return None
+
+        row = {
+            "title": _truncate(paper.title, 500),
+            "authors": paper.authors or [],
+            "abstract": paper.abstract or "",
+            "journal": _truncate(paper.journal, 200) or "Unknown",
+            # Stored as naive UTC
+            "published_at": paper.published_at.replace(tzinfo=None),
+            "doi": _truncate(normalize_doi(paper.doi), 100),
+            "arxiv_id": _truncate(normalize_arxiv_id(paper.arxiv_id), 50),
+            "keywords": paper.keywords or [],
+            "materials_focus": paper.materials_focus or [],
+            "pdf_url": _truncate(paper.pdf_url, 500),
+            "sources": paper.sources or ([paper.source] if paper.source else None),
+        }
+
+        # Without a unique identifier there is nothing to upsert on
+        if not row["doi"] and not row["arxiv_id"]:
+            return None
+
+        return row
+
+    def retag_papers(self, batch_size: int = RETAG_BATCH_SIZE) -> int:
+        """Recompute keywords and materials focus for every stored paper"""
+        db = SessionLocal()
+        retagged = 0
+        last_id = 0
+        try:
+            while True:
+                rows = db.execute(
+                    select(ResearchPaper.id, ResearchPaper.abstract)
+                    .where(ResearchPaper.id > last_id)
+                    .order_by(ResearchPaper.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+
+                tags = materials_tagger.tag_many([row.abstract for row in rows])
+                db.execute(update(ResearchPaper), [
+                    {"id": row.id, "keywords": keywords, "materials_focus": materials_focus}
+                    for row, (keywords, materials_focus) in zip(rows, tags)
+                ])
+                db.commit()
+
+                retagged += len(rows)
+                last_id = rows[-1].id
+
+            return retagged
+
+        finally:
+            db.close()
+
+    def _try_lock(self, db) -> bool:
+        return bool(db.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": INGESTION_LOCK_KEY}).scalar())
+
+    def _unlock(self, db, acquired: bool):
+        try:
+            if acquired:
+                db.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": INGESTION_LOCK_KEY})
+        finally:
+            db.close()
+
+    async def run_forever(self):
+        """Run ingestion passes on a fixed interval until cancelled"""
+        while True:
+            try:
+                results = await self.run_once()
+                if results:
+                    print(f"Ingestion finished: {results}")
+            except Exception as e:
+                print(f"Error during ingestion run: {e}")
+
+            await asyncio.sleep(INGESTION_INTERVAL_MINUTES * 60)
+
+    def start(self):
+        """Start the background ingestion loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        """Stop the background ingestion loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+if __name__ == "__main__":
+    # Run a single pass by hand: python -m services.ingestion_service
+    # or re-tag the stored corpus: python -m services.ingestion_service --retag
+    if "--retag" in sys.argv:
+        print(f"Re-tagged {IngestionService().retag_papers()} papers")
+    else:
+        print(asyncio.run(IngestionService().run_once()))
@@ -0,0 +1,174 @@
+import asyncio
+import os
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from sqlalchemy import event
+
+# Seconds between event-loop lag probes
+EVENT_LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("EVENT_LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "masot_http_request_duration_seconds", "Request latency per route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUESTS = Counter(
+    "masot_upstream_requests", "Upstream HTTP attempts per host and status, retries included",
+    ["host", "status"],
+)
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "masot_upstream_request_duration_seconds", "Upstream time to response headers per host, pacing waits excluded",
+    ["host"], buckets=LATENCY_BUCKETS,
+)
+SOURCE_FETCH_SECONDS = Histogram(
+    "masot_source_fetch_duration_seconds", "Source search latency per outcome (ok, error, timeout, queue_timeout, circuit_open)",
+    ["source", "outcome"], buckets=LATENCY_BUCKETS,
+)
+SOURCE_ERRORS = Counter(
+    "masot_source_errors", "Source failures answered with an empty result, by exception type",
+    ["source", "error"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "masot_db_query_duration_seconds", "Database statement latency per operation and table",
+    ["operation", "table"], buckets=FAST_BUCKETS,
+)
+RESPONSE_ENCODE_SECONDS = Histogram(
+    "masot_response_encode_duration_seconds", "JSON encoding time per response body",
+    buckets=FAST_BUCKETS,
+)
+HOT_FEED_LOOKUPS = Counter(
+    "masot_hot_feed_lookups", "Listings answered from the in-memory hot feed (hit) or the database (miss)",
+    ["result"],
+)
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "masot_event_loop_lag_seconds", "How late the event loop woke a sleeping probe",
+    buckets=FAST_BUCKETS,
+)
+
+# Leading keyword, then the table of UPDATE x SET or the first FROM / INTO / TABLE
+STATEMENT_LABELS = re.compile(
+    r'^\s*(\w+)(?:\s+"?(\w+)"?\s+SET\b|.*?\b(?:FROM|INTO|TABLE)\s+"?(\w+))?',
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Timing spans of the request being served, reported in its Server-Timing header
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> Dict[str, float]:
+    """Fresh span totals for the current request, shared with the tasks it spawns"""
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def add_timing(span: str, seconds: float):
+    """Add time to a span of the current request, a no-op outside one"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[span] = timings.get(span, 0.0) + seconds
+
+
+def server_timing_header(timings: Dict[str, float], total_seconds: float) -> str:
+    """Server-Timing value, durations in milliseconds"""
+    spans = [f"{span};dur={seconds * 1000:.1f}" for span, seconds in timings.items()]
+    spans.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(spans)
+
+
+@lru_cache(maxsize=512)
+def statement_labels(statement: str) -> Tuple[str, str]:
+    """(operation, table) labels for a SQL statement, e.g. ("select", "research_papers")"""
+    match = STATEMENT_LABELS.match(statement)
+    if not match:
+        return "other", ""
+    operation, updated, table = match.groups()
+    return operation.lower(), (updated or table or "").lower()
+
+
+def instrument_engine(engine):
+    """Time every statement a (sync) engine runs, for async engines pass .sync_engine"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        DB_QUERY_SECONDS.labels(*statement_labels(statement)).observe(elapsed)
+        add_timing("db", elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        started = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+        if started:
+            started.pop()
+
+
+class EventLoopMonitor:
+    """Samples how late the event loop runs a timer, a stand-in for time spent blocked"""
+
+    def __init__(self, interval_seconds: float = EVENT_LOOP_LAG_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            EVENT_LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - expected))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._probe())
+
+    async def stop(self):
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+class UpstreamCollector:
+    """Exposes the upstream cache and request scheduler counters at scrape time"""
+
+    def __init__(self, cache, http):
+        self.cache = cache
+        self.http = http
+
+    def collect(self):
+        stats = self.cache.stats
+        lookups = CounterMetricFamily("masot_upstream_cache_lookups", "Upstream cache lookups by result", labels=["result"])
+        for result in ("hits", "misses", "coalesced"):
+            lookups.add_metric([result], stats[result])
+        yield lookups
+        yield GaugeMetricFamily("masot_upstream_cache_hit_ratio", "Share of lookups served without a new upstream call", value=stats["hit_ratio"])
+        yield GaugeMetricFamily("masot_upstream_cache_entries", "Entries held by this worker's cache", value=stats["entries"])
+
+        queue_depth = GaugeMetricFamily("masot_upstream_queue_depth", "Requests waiting for a provider's rate limit", labels=["host"])
+        waited = CounterMetricFamily("masot_upstream_wait_seconds", "Time spent waiting for a provider's rate limit", labels=["host"])
+        retries = CounterMetricFamily("masot_upstream_retries", "Retried upstream requests", labels=["host"])
+        for host, metrics in self.http.metrics().items():
+            queue_depth.add_metric([host], metrics["queue_depth"])
+            waited.add_metric([host], metrics["wait_seconds_total"])
+            retries.add_metric([host], metrics["retries"])
+        yield queue_depth
+        yield waited
+        yield retries
+
+
+event_loop_monitor = EventLoopMonitor()
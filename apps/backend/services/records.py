@@ -0,0 +1,115 @@
+import re
+import sys
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+DATE_PATTERN = re.compile(r"^\s*(\d{4})(?:[\s-]+([A-Za-z]{3})[A-Za-z]*)?(?:[\s-]+(\d{1,2}))?")
+
+# Papers without a date sort after every dated one
+UNDATED = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def parse_datetime_utc(value: Any) -> Optional[datetime]:
+    """Parse the date formats returned by the sources into an aware UTC datetime"""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    if not value:
+        return None
+
+    # ISO timestamps, e.g. "2024-01-05T10:00:00Z"
+    try:
+        return parse_datetime_utc(datetime.fromisoformat(str(value).replace("Z", "+00:00")))
+    except ValueError:
+        pass
+
+    # PMC "2024 Jan 5" / "2024 Jan-Feb" / "2024" and DOAJ bare years
+    match = DATE_PATTERN.match(str(value))
+    if not match:
+        return None
+
+    year, month_name, day = match.groups()
+    month = MONTHS.get(month_name.lower(), 1) if month_name else 1
+    try:
+        return datetime(int(year), month, int(day) if day else 1, tzinfo=timezone.utc)
+    except ValueError:
+        return datetime(int(year), month, 1, tzinfo=timezone.utc)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+@dataclass(slots=True)
+class PaperRecord:
+    """One paper from any source, with a UTC publication date and interned labels"""
+
+    title: str
+    authors: List[str]
+    abstract: str
+    journal: str
+    published_at: Optional[datetime]
+    source: str
+    arxiv_id: Optional[str] = None
+    pmc_id: Optional[str] = None
+    doi: Optional[str] = None
+    keywords: List[str] = field(default_factory=list)
+    materials_focus: List[str] = field(default_factory=list)
+    pdf_url: Optional[str] = None
+    url: Optional[str] = None
+    # Set when duplicates from several sources are merged into this record
+    sources: Optional[List[str]] = None
+    provenance: Optional[List[Dict[str, Any]]] = None
+
+    def __post_init__(self):
+        # Thousands of records share a handful of sources, journals and
+        # categories, interning keeps one copy of each string
+        self.source = _intern(self.source)
+        self.journal = _intern(self.journal)
+        self.keywords = [sys.intern(keyword) for keyword in self.keywords or ()]
+        self.materials_focus = [sys.intern(category) for category in self.materials_focus or ()]
+        if not isinstance(self.published_at, datetime) or self.published_at.tzinfo is not timezone.utc:
+            self.published_at = parse_datetime_utc(self.published_at)
+
+    @property
+    def sort_key(self) -> datetime:
+        """Publication date for newest-first sorting across sources"""
+        return self.published_at or UNDATED
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in FIELD_NAMES}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PaperRecord":
+        return cls(**{name: data[name] for name in FIELD_NAMES if name in data})
+
+
+FIELD_NAMES = [f.name for f in fields(PaperRecord)]
+
+
+def _default(value: Any) -> Any:
+    # Numeric columns such as impact_factor come back from the database as Decimal
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """JSON-encode records, datetimes and plain containers in one pass"""
+    return orjson.dumps(value, default=_default)
+
+
+def loads_records(data: bytes) -> List[PaperRecord]:
+    """Records back from a JSON list written by dumps"""
+    return [PaperRecord.from_dict(item) for item in orjson.loads(data)]
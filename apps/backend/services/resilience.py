@@ -0,0 +1,119 @@
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Circuit breaker settings from environment
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "60"))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a source whose circuit is open"""
+
+
+class QueueTimeoutError(asyncio.TimeoutError):
+    """Raised when a source's deadline passes before its requests leave the rate-limit queue"""
+
+
+class CircuitBreaker:
+    """Skips a failing source for a cool-down period after repeated failures"""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, cooldown_seconds: float = CIRCUIT_COOLDOWN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        # After the cool-down calls go through again, one more failure re-opens
+        return "half_open" if self.retry_after <= 0 else "open"
+
+    @property
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+def source_status(error: Optional[BaseException]) -> str:
+    """Status reported for a source fetch that ended with this error"""
+    if error is None:
+        return "ok"
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    return "error"
+
+
+async def as_completed_sources(
+    fetchers: Dict[str, Callable[[], Awaitable[List[Dict[str, Any]]]]],
+    budget_seconds: Optional[float] = None,
+    max_parallel: Optional[int] = None,
+) -> AsyncIterator[Tuple[str, List[Dict[str, Any]], Dict[str, Any]]]:
+    """Run the sources concurrently, at most max_parallel at a time, and yield (source, papers, status) as each finishes"""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    slots = asyncio.Semaphore(max_parallel) if max_parallel else None
+
+    async def run(source: str, fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        error = None
+        try:
+            if slots is None:
+                papers = await fetch()
+            else:
+                async with slots:
+                    papers = await fetch()
+        except Exception as e:
+            print(f"Error fetching from {source}: {e!r}")
+            papers, error = [], e
+        status = {
+            "status": source_status(error),
+            "count": len(papers),
+            "latency_ms": round((loop.time() - started) * 1000, 1),
+        }
+        if error is not None:
+            status["error"] = str(error) or type(error).__name__
+        return source, papers, status
+
+    tasks = {asyncio.ensure_future(run(source, fetch)): source for source, fetch in fetchers.items()}
+    deadline = started + budget_seconds if budget_seconds is not None else None
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = None if deadline is None else deadline - loop.time()
+            if timeout is not None and timeout <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+        # Out of budget, report what's left as timed out and return partial results
+        for task in pending:
+            task.cancel()
+            yield tasks[task], [], {
+                "status": "timeout",
+                "count": 0,
+                "latency_ms": round((loop.time() - started) * 1000, 1),
+                "error": "request budget exceeded",
+            }
+    finally:
+        # Client went away mid-stream, don't leave fetches running for nobody
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+# Request pacing per host as rate/burst, in requests per second. NCBI allows
+# 3 requests/s without an API key, DOAJ 2/s with short bursts and ArXiv
+# asks for 3 s between calls
+UPSTREAM_RATE_LIMITS = {
+    host.strip(): (float(limit.split("/", 1)[0]), float(limit.split("/", 1)[1]) if "/" in limit else 1.0)
+    for host, limit in (
+        item.split("=", 1)
+        for item in os.getenv(
+            "UPSTREAM_RATE_LIMITS", "eutils.ncbi.nlm.nih.gov=3/3,doaj.org=2/5,export.arxiv.org=0.333/1"
+        ).split(",")
+        if "=" in item
+    )
+}
+
+# Retries for throttled and failing upstream responses
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+UPSTREAM_RETRY_BASE_SECONDS = float(os.getenv("UPSTREAM_RETRY_BASE_SECONDS", "0.5"))
+UPSTREAM_RETRY_MAX_SECONDS = float(os.getenv("UPSTREAM_RETRY_MAX_SECONDS", "30"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket refilled at rate tokens/s up to burst, which a Retry-After can pause"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float):
+        start = max(self.updated, self.paused_until)
+        if now > start:
+            self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+        self.updated = max(self.updated, now)
+
+    def take(self) -> float:
+        """Take a token, or return how many seconds until one is available"""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def pause(self, seconds: float):
+        """Hand out nothing for the next few seconds, then start again from empty"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class ProviderScheduler:
+    """Paces one provider's requests through a token bucket, first come first served"""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.bucket = TokenBucket(rate, burst)
+        self._turn: Optional[asyncio.Lock] = None
+        self.queue_depth = 0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def acquire(self):
+        """Wait for this request's turn and a token"""
+        if self._turn is None:
+            self._turn = asyncio.Lock()
+        queued_at = time.monotonic()
+        self.queue_depth += 1
+        try:
+            # The lock queues waiters in arrival order, so the head of the
+            # queue takes each token as it refills and nobody jumps ahead
+            async with self._turn:
+                while True:
+                    delay = self.bucket.take()
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - queued_at
+        self.requests += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_retry(self, status_code: int, retry_after: Optional[float]):
+        self.retries += 1
+        if status_code == 429:
+            self.throttled += 1
+            # Throttling applies to the whole provider, hold back every queued request
+            self.bucket.pause(retry_after if retry_after is not None else 1 / self.bucket.rate)
+
+    def reset_loop_state(self):
+        """Forget the lock, which belongs to the event loop that used it"""
+        self._turn = None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "rate_per_second": self.bucket.rate,
+            "burst": self.bucket.burst,
+            "queue_depth": self.queue_depth,
+            "requests": self.requests,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.requests, 3) if self.requests else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+        }
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header, given either as a delay or an HTTP date"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_delay(attempt: int, retry_after: Optional[float], base_seconds: float = UPSTREAM_RETRY_BASE_SECONDS) -> float:
+    """Backoff before retry number attempt (from 0): Retry-After when given, else full jitter"""
+    if retry_after is not None:
+        # A little jitter so queued requests don't all return at the same instant
+        return min(UPSTREAM_RETRY_MAX_SECONDS, retry_after + random.uniform(0, base_seconds))
+    return random.uniform(0, min(UPSTREAM_RETRY_MAX_SECONDS, base_seconds * (2 ** attempt)))
+
+
+def create_schedulers(rate_limits: Dict[str, Tuple[float, float]]) -> Dict[str, ProviderScheduler]:
+    return {host: ProviderScheduler(rate, burst) for host, (rate, burst) in rate_limits.items()}
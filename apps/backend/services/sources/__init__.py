@@ -0,0 +1,15 @@
+from .base import MATERIALS_KEYWORDS, SourceAdapter
+from .registry import ENABLED_SOURCES, SOURCE_ADAPTERS, create_adapters, register_adapter
+from .executor import ALL_SOURCES_BUDGET_SECONDS, SOURCE_MAX_PARALLEL, SourceExecutor
+
+# Importing the adapter modules registers them
+from .arxiv import ArxivAdapter
+from .core import CoreAdapter
+from .doaj import DOAJAdapter
+from .pubmed_central import PubMedCentralAdapter
+
+__all__ = [
+    'ALL_SOURCES_BUDGET_SECONDS', 'ENABLED_SOURCES', 'MATERIALS_KEYWORDS', 'SOURCE_ADAPTERS', 'SOURCE_MAX_PARALLEL',
+    'ArxivAdapter', 'CoreAdapter', 'DOAJAdapter', 'PubMedCentralAdapter', 'SourceAdapter', 'SourceExecutor',
+    'create_adapters', 'register_adapter',
+]
@@ -0,0 +1,133 @@
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..dedup import normalize_doi
+from ..records import PaperRecord
+from .base import SourceAdapter
+from .registry import register_adapter
+
+ARXIV_API_URL = os.getenv("ARXIV_API_URL", "https://export.arxiv.org/api/query")
+# IDs per id_list request, keeps the query string well under URL length limits
+ARXIV_ID_LIST_BATCH_SIZE = int(os.getenv("ARXIV_ID_LIST_BATCH_SIZE", "100"))
+
+# Atom feed namespaces used by the ArXiv API
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+
+DOI_IN_TEXT = re.compile(r'10\.\d{4,}/[-._;()/:\w]+')
+
+
+def submitted_date_range(since: datetime, until: Optional[datetime] = None) -> str:
+    """ArXiv submittedDate range clause, open-ended when until is None"""
+    # The API takes UTC YYYYMMDDHHMM bounds
+    end = (until or datetime.utcnow()).strftime("%Y%m%d%H%M")
+    return f"submittedDate:[{since.strftime('%Y%m%d%H%M')} TO {end}]"
+
+
+def extract_doi(text: str) -> Optional[str]:
+    """Extract DOI from text if present"""
+    match = DOI_IN_TEXT.search(text or "")
+    return match.group() if match else None
+
+
+@register_adapter
+class ArxivAdapter(SourceAdapter):
+    name = "arxiv"
+    display_name = "ArXiv"
+    base_url = ARXIV_API_URL
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Search ArXiv for a topic in materials papers, raising on upstream errors"""
+        search_query = f'"{query}" AND materials'
+        if since is not None:
+            search_query = f"{search_query} AND {submitted_date_range(since, until)}"
+        return await self.fetch_feed(search_query, max_results, start=offset)
+
+    async def fetch_feed(self, search_query: str, max_results: int, sort_order: str = "descending", start: int = 0) -> List[PaperRecord]:
+        """Search the ArXiv Atom API, newest or oldest submissions first, from the start-th result"""
+        params = {
+            "search_query": search_query,
+            "start": start,
+            "max_results": max_results,
+            "sortBy": "submittedDate",
+            "sortOrder": sort_order
+        }
+        return await self._fetch_entries(params)
+
+    async def fetch_by_ids(self, arxiv_ids: List[str], batch_size: int = ARXIV_ID_LIST_BATCH_SIZE) -> List[PaperRecord]:
+        """Look papers up by arXiv ID through id_list, one request per batch, raising on upstream errors"""
+        papers = []
+        for start in range(0, len(arxiv_ids), batch_size):
+            batch = arxiv_ids[start:start + batch_size]
+            papers.extend(await self._fetch_entries({"id_list": ",".join(batch), "max_results": len(batch)}))
+        return papers
+
+    async def _fetch_entries(self, params: Dict[str, Any]) -> List[PaperRecord]:
+        """Query the ArXiv Atom API, parsing entries as the response streams in"""
+        papers = []
+        parser = ET.XMLPullParser(events=("end",))
+
+        async with self.http.stream("GET", self.base_url, params=params) as response:
+            response.raise_for_status()
+
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if element.tag == f"{ATOM_NS}entry":
+                        # Unknown IDs in an id_list come back as error entries
+                        if "/api/errors" not in element.findtext(f"{ATOM_NS}id", ""):
+                            papers.append(self._entry_to_paper(element))
+                        # Drop the parsed entry so memory stays flat
+                        element.clear()
+
+        parser.close()
+        return papers
+
+    def _entry_to_paper(self, entry: ET.Element) -> PaperRecord:
+        """Build a paper object from an Atom feed entry"""
+        entry_id = entry.findtext(f"{ATOM_NS}id", "").strip()
+        title = re.sub(r"\s+", " ", entry.findtext(f"{ATOM_NS}title", "")).strip()
+        summary = entry.findtext(f"{ATOM_NS}summary", "").strip()
+
+        # Extract authors
+        authors = [
+            author.findtext(f"{ATOM_NS}name", "").strip()
+            for author in entry.findall(f"{ATOM_NS}author")
+        ]
+
+        pdf_url = None
+        for link in entry.findall(f"{ATOM_NS}link"):
+            if link.get("title") == "pdf":
+                pdf_url = link.get("href")
+
+        # Prefer the DOI ArXiv reports over one found in the abstract
+        doi = normalize_doi(entry.findtext(f"{ARXIV_NS}doi")) or extract_doi(summary)
+
+        # Versionless, and old-style IDs keep their archive ("cond-mat/0102536")
+        return self.make_paper(
+            title=title,
+            authors=authors,
+            abstract=summary,
+            journal="ArXiv",
+            published_at=self._parse_datetime(entry.findtext(f"{ATOM_NS}published")),
+            doi=doi,
+            arxiv_id=entry_id,
+            pdf_url=pdf_url,
+            url=entry_id,
+        )
+
+    def _parse_datetime(self, value: Optional[str]) -> Optional[datetime]:
+        """Parse an Atom timestamp such as 2024-01-05T18:00:00Z"""
+        if not value:
+            return None
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
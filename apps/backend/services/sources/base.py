@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, List, Optional
+
+from ..dedup import normalize_arxiv_id, normalize_doi
+from ..http import UpstreamHTTP, upstream_http
+from ..records import PaperRecord
+from ..tagging import materials_tagger
+
+# Terms the materials-science queries are built from
+MATERIALS_KEYWORDS = [
+    "materials science",
+    "nanomaterials",
+    "graphene",
+    "carbon nanotubes",
+    "quantum dots",
+    "perovskite",
+    "metal organic frameworks",
+    "MOF",
+    "2D materials",
+    "composite materials",
+    "polymer",
+    "ceramic",
+    "metallic",
+    "semiconductor",
+    "superconductor",
+    "catalyst",
+    "battery materials",
+    "solar cell materials",
+    "biomaterials",
+    "smart materials"
+]
+
+
+class SourceAdapter(ABC):
+    """One upstream paper source, searched through the shared HTTP pool"""
+
+    # Registry key, label shown to clients and default API endpoint
+    name: str = ""
+    display_name: str = ""
+    base_url: str = ""
+
+    def __init__(self, http: Optional[UpstreamHTTP] = None, base_url: Optional[str] = None):
+        self.http = http or upstream_http
+        self.base_url = (base_url or self.base_url).rstrip("/")
+
+    @property
+    def available(self) -> bool:
+        """Whether the adapter can run, e.g. has the API key it needs"""
+        return True
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Search for materials papers added in the window, skipping the first offset results, raising on upstream errors"""
+
+    def make_paper(
+        self,
+        title: str,
+        authors: List[str],
+        abstract: str,
+        journal: str,
+        published_at: Any,
+        doi: Optional[str] = None,
+        arxiv_id: Optional[str] = None,
+        pmc_id: Optional[str] = None,
+        pdf_url: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> PaperRecord:
+        """Paper record tagged from its abstract, labelled with this source"""
+        keywords, materials_focus = materials_tagger.tag(abstract or "")
+        return PaperRecord(
+            title=title,
+            authors=authors,
+            abstract=abstract,
+            journal=journal,
+            published_at=published_at,
+            source=self.display_name,
+            arxiv_id=normalize_arxiv_id(arxiv_id),
+            pmc_id=pmc_id,
+            doi=normalize_doi(doi),
+            keywords=keywords,
+            materials_focus=materials_focus,
+            pdf_url=pdf_url,
+            url=url,
+        )
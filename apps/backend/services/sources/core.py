@@ -0,0 +1,61 @@
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..records import PaperRecord
+from .base import SourceAdapter
+from .registry import register_adapter
+
+CORE_API_URL = os.getenv("CORE_API_URL", "https://api.core.ac.uk/v3/search/works")
+CORE_API_KEY = os.getenv("CORE_API_KEY", "")
+
+
+@register_adapter
+class CoreAdapter(SourceAdapter):
+    name = "core"
+    display_name = "CORE"
+    base_url = CORE_API_URL
+
+    @property
+    def available(self) -> bool:
+        # CORE requires an API key, without one the source stays off
+        return bool(CORE_API_KEY)
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Search the CORE repository, raising on upstream errors"""
+        search_query = f"({query}) AND (materials OR nanotechnology OR graphene OR polymer)"
+        if since is not None:
+            search_query = f"{search_query} AND createdDate>={since.strftime('%Y-%m-%d')}"
+            if until is not None:
+                search_query = f"{search_query} AND createdDate<={until.strftime('%Y-%m-%d')}"
+
+        response = await self.http.get(
+            self.base_url,
+            params={"q": search_query, "limit": max_results, "offset": offset},
+            headers={"Authorization": f"Bearer {CORE_API_KEY}"},
+        )
+        response.raise_for_status()
+
+        return [self._build_paper(work) for work in response.json().get("results", [])]
+
+    def _build_paper(self, work: Dict[str, Any]) -> PaperRecord:
+        """Build a paper object from a CORE work"""
+        journals = work.get("journals") or [{}]
+        return self.make_paper(
+            title=work.get("title") or "",
+            authors=[author["name"] for author in work.get("authors") or [] if author.get("name")],
+            abstract=work.get("abstract") or "",
+            journal=journals[0].get("title") or "CORE",
+            published_at=work.get("publishedDate") or work.get("yearPublished") or "",
+            doi=work.get("doi"),
+            arxiv_id=work.get("arxivId"),
+            pdf_url=work.get("downloadUrl"),
+            url=(work.get("sourceFulltextUrls") or [work.get("downloadUrl")])[0],
+        )
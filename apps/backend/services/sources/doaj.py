@@ -0,0 +1,69 @@
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..dedup import normalize_doi
+from ..records import PaperRecord
+from .base import SourceAdapter
+from .registry import register_adapter
+
+DOAJ_API_URL = os.getenv("DOAJ_API_URL", "https://doaj.org/api/v2/search/articles")
+
+
+@register_adapter
+class DOAJAdapter(SourceAdapter):
+    name = "doaj"
+    display_name = "DOAJ"
+    base_url = DOAJ_API_URL
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Search DOAJ, raising on upstream errors"""
+        search_query = f"({query}) AND (materials OR nanotechnology)"
+
+        # Window on when DOAJ added the article, bibjson.year is too coarse
+        if since is not None:
+            until_date = until.strftime("%Y-%m-%d") if until is not None else "*"
+            search_query = f"{search_query} AND created_date:[{since.strftime('%Y-%m-%d')} TO {until_date}]"
+
+        params = {
+            "q": search_query,
+            # Pages are numbered from 1, ingestion pages by whole pageSize steps
+            "page": offset // max_results + 1,
+            "pageSize": max_results,
+            "sort": "publishedDate:desc"
+        }
+
+        response = await self.http.get(self.base_url, params=params)
+        response.raise_for_status()
+
+        return [self._build_paper(article.get("bibjson", {})) for article in response.json().get("results", [])]
+
+    def _build_paper(self, bibjson: Dict[str, Any]) -> PaperRecord:
+        """Build a paper object from a DOAJ article's bibjson"""
+        authors = [author["name"] for author in bibjson.get("author", []) if "name" in author]
+
+        # Identifiers also carry ISSNs, only take the one typed as a DOI
+        doi = None
+        for identifier in bibjson.get("identifier", []):
+            if str(identifier.get("type", "")).lower() == "doi":
+                doi = normalize_doi(identifier.get("id"))
+                break
+
+        link = (bibjson.get("link") or [{}])[0].get("url", "")
+        return self.make_paper(
+            title=bibjson.get("title", ""),
+            authors=authors,
+            abstract=bibjson.get("abstract", ""),
+            journal=bibjson.get("journal", {}).get("title", "DOAJ"),
+            published_at=bibjson.get("year", ""),
+            doi=doi,
+            pdf_url=link,
+            url=link,
+        )
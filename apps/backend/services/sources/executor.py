@@ -0,0 +1,136 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..http import UpstreamActivity, upstream_activity
+from ..metrics import SOURCE_FETCH_SECONDS, add_timing
+from ..records import PaperRecord
+from ..resilience import CircuitBreaker, CircuitOpenError, QueueTimeoutError, as_completed_sources
+from .base import SourceAdapter
+
+# Deadline per source call, overridable per source as "doaj=5,pubmed_central=12"
+SOURCE_TIMEOUT_SECONDS = float(os.getenv("SOURCE_TIMEOUT_SECONDS", "10"))
+SOURCE_TIMEOUTS = {
+    source.strip(): float(seconds)
+    for source, seconds in (
+        item.split("=", 1) for item in os.getenv("SOURCE_TIMEOUTS", "").split(",") if "=" in item
+    )
+}
+
+# Overall budget for an all-sources request, slower sources come back partial
+ALL_SOURCES_BUDGET_SECONDS = float(os.getenv("ALL_SOURCES_BUDGET_SECONDS", "12"))
+
+# Sources one fan-out runs at the same time
+SOURCE_MAX_PARALLEL = int(os.getenv("SOURCE_MAX_PARALLEL", "8"))
+
+Fetcher = Callable[[], Awaitable[List[PaperRecord]]]
+
+
+async def within_deadline(search: Awaitable[List[PaperRecord]], timeout: float) -> List[PaperRecord]:
+    """Await a source search, raising QueueTimeoutError if the deadline passes while it only waits for its turn"""
+    activity = UpstreamActivity()
+    # The task runs in a copy of this context, so its requests report into activity
+    token = upstream_activity.set(activity)
+    try:
+        task = asyncio.ensure_future(search)
+    finally:
+        upstream_activity.reset(token)
+
+    try:
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    if done:
+        return task.result()
+
+    # Look before cancelling, which unwinds the requests
+    only_queued = activity.only_queued
+    task.cancel()
+    await asyncio.wait({task})
+    if only_queued:
+        raise QueueTimeoutError(f"still queued for an upstream slot after {timeout:g}s")
+    raise asyncio.TimeoutError()
+
+
+class SourceExecutor:
+    """Runs source adapters under per-source deadlines and circuit breakers, fanning out across them"""
+
+    def __init__(self, adapters: Dict[str, SourceAdapter], max_parallel: int = SOURCE_MAX_PARALLEL):
+        self.adapters = adapters
+        self.max_parallel = max_parallel
+        self.breakers = {source: CircuitBreaker() for source in adapters}
+        self.timeouts = {source: SOURCE_TIMEOUTS.get(source, SOURCE_TIMEOUT_SECONDS) for source in adapters}
+
+    def display_name(self, source: str) -> str:
+        adapter = self.adapters.get(source)
+        return adapter.display_name if adapter else source
+
+    async def fetch_guarded(
+        self,
+        source: str,
+        query: str,
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Fetch one source under its deadline and circuit breaker, raising on failure"""
+        adapter = self.adapters.get(source)
+        if adapter is None:
+            raise ValueError(f"Source {source} is unknown or not enabled")
+
+        breaker = self.breakers[source]
+        if not breaker.allow():
+            SOURCE_FETCH_SECONDS.labels(source, "circuit_open").observe(0)
+            raise CircuitOpenError(f"{adapter.display_name} skipped for {breaker.retry_after:.0f}s after repeated failures")
+
+        started = time.perf_counter()
+        try:
+            papers = await within_deadline(adapter.search(query, max_results, since, until, offset), self.timeouts[source])
+        except QueueTimeoutError:
+            # Held back by our own rate limit, the upstream was never asked
+            self._observe(source, "queue_timeout", started)
+            raise
+        except Exception as e:
+            breaker.record_failure()
+            self._observe(source, "timeout" if isinstance(e, asyncio.TimeoutError) else "error", started)
+            raise
+
+        breaker.record_success()
+        self._observe(source, "ok", started)
+        return papers
+
+    def _observe(self, source: str, outcome: str, started: float):
+        elapsed = time.perf_counter() - started
+        SOURCE_FETCH_SECONDS.labels(source, outcome).observe(elapsed)
+        add_timing(f"source.{source}", elapsed)
+
+    def source_fetchers(
+        self,
+        query: str = "materials science",
+        max_results: int = 10,
+        since: Optional[datetime] = None,
+    ) -> Dict[str, Fetcher]:
+        """Guarded fetch callables for each source, so callers can run and wrap them one by one"""
+        return {source: partial(self.fetch_guarded, source, query, max_results, since) for source in self.adapters}
+
+    async def fan_out(
+        self,
+        query: str = "materials science",
+        max_results: int = 10,
+        since: Optional[datetime] = None,
+        budget_seconds: Optional[float] = ALL_SOURCES_BUDGET_SECONDS,
+        wrap: Optional[Callable[[str, Fetcher], Fetcher]] = None,
+    ) -> AsyncIterator[Tuple[str, List[PaperRecord], Dict[str, Any]]]:
+        """Run every enabled source, max_parallel at a time, yielding (source, papers, status) as each finishes"""
+        fetchers = self.source_fetchers(query, max_results, since)
+        # e.g. put a cache in front of each source
+        if wrap is not None:
+            fetchers = {source: wrap(source, fetch) for source, fetch in fetchers.items()}
+
+        async for source, papers, status in as_completed_sources(fetchers, budget_seconds, self.max_parallel):
+            yield source, papers, status
@@ -0,0 +1,116 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..dedup import normalize_doi
+from ..records import PaperRecord
+from .base import SourceAdapter
+from .registry import register_adapter
+
+PMC_EUTILS_URL = os.getenv("PMC_EUTILS_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils")
+
+
+@register_adapter
+class PubMedCentralAdapter(SourceAdapter):
+    name = "pubmed_central"
+    display_name = "PubMed Central"
+    base_url = PMC_EUTILS_URL
+
+    # esummary IDs per request, concurrency is capped per host by UpstreamHTTP
+    summary_batch_size = 200
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 20,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        offset: int = 0,
+    ) -> List[PaperRecord]:
+        """Search PubMed Central, raising on upstream errors"""
+        search_params = {
+            "db": "pmc",
+            "term": query,
+            "retstart": offset,
+            "retmax": max_results,
+            "retmode": "json",
+            "sort": "date"
+        }
+
+        # Entrez date window, i.e. when PMC added the article, so late
+        # deposits of older papers still count as new
+        if since is not None:
+            search_params.update({
+                "datetype": "edat",
+                "mindate": since.strftime("%Y/%m/%d"),
+                "maxdate": (until or datetime.utcnow()).strftime("%Y/%m/%d"),
+            })
+
+        response = await self.http.get(f"{self.base_url}/esearch.fcgi", params=search_params)
+        response.raise_for_status()
+
+        id_list = response.json().get("esearchresult", {}).get("idlist", [])
+        if not id_list:
+            return []
+
+        # Summarize IDs in batches, one esummary call per batch, with the
+        # batches running concurrently under the NCBI host cap
+        id_list = id_list[:max_results]
+        batches = [
+            id_list[i:i + self.summary_batch_size]
+            for i in range(0, len(id_list), self.summary_batch_size)
+        ]
+        summaries = await asyncio.gather(*(self._fetch_summaries(batch) for batch in batches))
+
+        papers = []
+        for batch, summary in zip(batches, summaries):
+            for pmc_id in batch:
+                paper_data = summary.get(pmc_id)
+                if paper_data:
+                    papers.append(self._build_paper(pmc_id, paper_data))
+
+        return papers
+
+    async def _fetch_summaries(self, pmc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch esummary records for a batch of PMC IDs in a single request"""
+        try:
+            # E-utilities accepts a comma-separated ID list
+            summary_params = {
+                "db": "pmc",
+                "id": ",".join(pmc_ids),
+                "retmode": "json"
+            }
+
+            response = await self.http.get(f"{self.base_url}/esummary.fcgi", params=summary_params)
+            response.raise_for_status()
+
+            result = response.json().get("result", {})
+            return {pmc_id: result[pmc_id] for pmc_id in result.get("uids", pmc_ids) if pmc_id in result}
+
+        except Exception as e:
+            print(f"Error fetching PMC paper summaries: {e}")
+            return {}
+
+    def _build_paper(self, pmc_id: str, paper_data: Dict[str, Any]) -> PaperRecord:
+        """Build a paper object from a PMC esummary record"""
+        authors = [author["name"] for author in paper_data.get("authors", []) if "name" in author]
+
+        # The DOI article ID is reliable, elocationid is often "doi: ..." or a page number
+        doi = None
+        for article_id in paper_data.get("articleids", []):
+            if article_id.get("idtype") == "doi":
+                doi = normalize_doi(article_id.get("value"))
+                break
+
+        return self.make_paper(
+            title=paper_data.get("title", ""),
+            authors=authors,
+            abstract=paper_data.get("abstract", ""),
+            journal=paper_data.get("fulljournalname", "PubMed Central"),
+            published_at=paper_data.get("pubdate", ""),
+            doi=doi or paper_data.get("elocationid"),
+            pmc_id=pmc_id,
+            pdf_url=f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmc_id}/pdf/",
+            url=f"https://www.ncbi.nlm.nih.gov/pmc/articles/PMC{pmc_id}/",
+        )
@@ -0,0 +1,38 @@
+import os
+from typing import Dict, List, Optional, Type
+
+from ..http import UpstreamHTTP
+from .base import SourceAdapter
+
+# Sources the fan-out runs, in order; ones that aren't available (e.g. CORE
+# without an API key) are skipped
+ENABLED_SOURCES = [
+    source.strip()
+    for source in os.getenv("ENABLED_SOURCES", "arxiv,pubmed_central,doaj,core").split(",")
+    if source.strip()
+]
+
+SOURCE_ADAPTERS: Dict[str, Type[SourceAdapter]] = {}
+
+
+def register_adapter(adapter_class: Type[SourceAdapter]) -> Type[SourceAdapter]:
+    """Class decorator adding an adapter to the registry under its name"""
+    SOURCE_ADAPTERS[adapter_class.name] = adapter_class
+    return adapter_class
+
+
+def create_adapters(
+    http: Optional[UpstreamHTTP] = None,
+    sources: Optional[List[str]] = None,
+    base_urls: Optional[Dict[str, str]] = None,
+) -> Dict[str, SourceAdapter]:
+    """Instances of the enabled, available adapters keyed by source name"""
+    adapters = {}
+    for source in ENABLED_SOURCES if sources is None else sources:
+        if source not in SOURCE_ADAPTERS:
+            print(f"Unknown source in ENABLED_SOURCES: {source}")
+            continue
+        adapter = SOURCE_ADAPTERS[source](http, (base_urls or {}).get(source))
+        if adapter.available:
+            adapters[source] = adapter
+    return adapters
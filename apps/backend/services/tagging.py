@@ -0,0 +1,115 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+import ahocorasick
+
+# Common materials science terms reported as keywords
+KEYWORD_TERMS = [
+    "nanoparticle", "nanostructure", "nanocomposite", "nanotechnology",
+    "quantum", "electronic", "optical", "magnetic", "thermal",
+    "mechanical", "electrochemical", "photovoltaic", "catalytic",
+    "synthesis", "characterization", "fabrication", "processing"
+]
+
+# Materials focus categories and the terms that signal them
+MATERIALS_CATEGORIES = {
+    "metals": ["metal", "alloy", "steel", "aluminum", "copper", "titanium"],
+    "ceramics": ["ceramic", "oxide", "nitride", "carbide"],
+    "polymers": ["polymer", "plastic", "resin", "composite"],
+    "nanomaterials": ["nanoparticle", "nanotube", "nanowire", "quantum dot"],
+    "2D materials": ["graphene", "molybdenum disulfide", "boron nitride"],
+    "biomaterials": ["biomaterial", "biocompatible", "tissue engineering"],
+    "energy materials": ["battery", "solar cell", "fuel cell", "supercapacitor"],
+    "electronic materials": ["semiconductor", "conductor", "insulator"]
+}
+
+MAX_KEYWORDS = 10
+
+# Never part of a term, so matches can't span two joined abstracts
+DOCUMENT_SEPARATOR = "\x00"
+
+
+class MaterialsTagger:
+    """Keyword and materials focus tagger backed by one Aho-Corasick automaton"""
+
+    def __init__(
+        self,
+        keyword_terms: Optional[List[str]] = None,
+        materials_categories: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.keyword_terms = list(keyword_terms or KEYWORD_TERMS)
+        materials_categories = materials_categories or MATERIALS_CATEGORIES
+        self.categories = list(materials_categories)
+
+        # Each distinct term maps to its keyword index and focus categories
+        entries: Dict[str, Tuple[Optional[int], set]] = {}
+        for index, term in enumerate(self.keyword_terms):
+            keyword_index, categories = entries.get(term.lower(), (None, set()))
+            entries[term.lower()] = (index if keyword_index is None else keyword_index, categories)
+        for index, terms in enumerate(materials_categories.values()):
+            for term in terms:
+                entries.setdefault(term.lower(), (None, set()))[1].add(index)
+
+        self._automaton = ahocorasick.Automaton()
+        for term, (keyword_index, categories) in entries.items():
+            self._automaton.add_word(term, (keyword_index, tuple(sorted(categories))))
+        self._automaton.make_automaton()
+
+    def tag(self, text: Optional[str]) -> Tuple[List[str], List[str]]:
+        """Return (keywords, materials focus) for a text in a single pass"""
+        if not text:
+            return [], []
+
+        keyword_hits = set()
+        category_hits = set()
+        for _, (keyword_index, categories) in self._automaton.iter(text.lower()):
+            if keyword_index is not None:
+                keyword_hits.add(keyword_index)
+            category_hits.update(categories)
+
+        return self._resolve(keyword_hits, category_hits)
+
+    def tag_many(self, texts: List[Optional[str]]) -> List[Tuple[List[str], List[str]]]:
+        """Tag a batch of texts with one automaton pass over all of them"""
+        # Offsets come from the lowercased texts, lowercasing can change a
+        # string's length (e.g. "İ" becomes two code points)
+        lowered = [(text or "").lower() for text in texts]
+        starts = []
+        position = 0
+        for text in lowered:
+            starts.append(position)
+            position += len(text) + len(DOCUMENT_SEPARATOR)
+
+        keyword_hits = [set() for _ in texts]
+        category_hits = [set() for _ in texts]
+
+        # Matches come back in text order, so the owning document only moves forward
+        joined = DOCUMENT_SEPARATOR.join(lowered)
+        document = 0
+        next_start = starts[1] if len(starts) > 1 else len(joined) + 1
+        for end_index, (keyword_index, categories) in self._automaton.iter(joined):
+            if end_index >= next_start:
+                document = bisect_right(starts, end_index) - 1
+                next_start = starts[document + 1] if document + 1 < len(starts) else len(joined) + 1
+            if keyword_index is not None:
+                keyword_hits[document].add(keyword_index)
+            category_hits[document].update(categories)
+
+        return [self._resolve(keywords, categories) for keywords, categories in zip(keyword_hits, category_hits)]
+
+    def extract_keywords(self, text: Optional[str]) -> List[str]:
+        """Extract potential keywords from text"""
+        return self.tag(text)[0]
+
+    def identify_materials_focus(self, text: Optional[str]) -> List[str]:
+        """Identify the main materials focus from text"""
+        return self.tag(text)[1]
+
+    def _resolve(self, keyword_hits: set, category_hits: set) -> Tuple[List[str], List[str]]:
+        keywords = [self.keyword_terms[index] for index in sorted(keyword_hits)][:MAX_KEYWORDS]
+        focus = [self.categories[index] for index in sorted(category_hits)]
+        return keywords, focus
+
+
+# Shared instance, the automaton is built once per process
+materials_tagger = MaterialsTagger()
@@ -4,40 +4,41 @@ Test script for ArXiv integration
 Run this to verify that we can fetch materials science papers from ArXiv
 """
 
+import asyncio
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.arxiv_service import ArxivService
 
-def test_arxiv_integration():
-    """Test the ArXiv service"""
+async def run_arxiv_checks():
+    """Run the ArXiv service checks on one event loop"""
     print("Testing ArXiv integration...")
     
     arxiv_service = ArxivService()
     
     # Test 1: Fetch recent materials papers
     print("\n1. Fetching recent materials science papers...")
-    papers = arxiv_service.fetch_materials_papers(max_results=5, days_back=30)
+    papers = await arxiv_service.fetch_materials_papers(max_results=5, days_back=30)
     
     if papers:
         print(f"✅ Successfully fetched {len(papers)} papers")
         for i, paper in enumerate(papers[:3], 1):
-            print(f"   {i}. {paper['title'][:80]}...")
-            print(f"      Authors: {', '.join(paper['authors'][:3])}")
-            print(f"      Materials Focus: {paper['materials_focus']}")
+            print(f"   {i}. {paper.title[:80]}...")
+            print(f"      Authors: {', '.join(paper.authors[:3])}")
+            print(f"      Materials Focus: {paper.materials_focus}")
             print()
     else:
         print("❌ No papers fetched")
     
     # Test 2: Search by specific topic
     print("\n2. Searching for graphene papers...")
-    graphene_papers = arxiv_service.search_by_topic("graphene", max_results=3)
+    graphene_papers = await arxiv_service.search_by_topic("graphene", max_results=3)
     
     if graphene_papers:
         print(f"✅ Found {len(graphene_papers)} graphene papers")
         for i, paper in enumerate(graphene_papers, 1):
-            print(f"   {i}. {paper['title'][:80]}...")
+            print(f"   {i}. {paper.title[:80]}...")
     else:
         print("❌ No graphene papers found")
     
@@ -52,7 +53,12 @@ def test_arxiv_integration():
     materials_focus = arxiv_service.identify_materials_focus(sample_text)
     print(f"✅ Identified materials focus: {materials_focus}")
     
+    await arxiv_service.close()
     print("\n🎉 ArXiv integration test completed!")
 
+def test_arxiv_integration():
+    """Test the ArXiv service"""
+    asyncio.run(run_arxiv_checks())
+
 if __name__ == "__main__":
     test_arxiv_integration() 
\ No newline at end of file
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+# Import the app modules the same way uvicorn does from apps/backend
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Scratch database the database tests may wipe, they are skipped without one
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+def async_database_url(url: str) -> str:
+    """The same database through the asyncpg driver"""
+    return url.replace("postgresql+psycopg2://", "postgresql://", 1).replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+class ScratchDatabase:
+    """Migrated, seeded test database with the app's request sessions pointed at it"""
+
+    def __init__(self, engine, async_engine, client):
+        self.engine = engine
+        self.async_engine = async_engine
+        self.client = client
+        # Every statement the request sessions send, tests clear it as needed
+        self.statements = []
+
+
+@pytest.fixture(scope="module")
+def database(request):
+    """ScratchDatabase seeded with the test module's SEED_SQL (run in autocommit, so it may VACUUM)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from alembic import command
+    from alembic.config import Config
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine, event, text
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from main import app
+    from models.database import ALEMBIC_INI, get_async_db, get_async_sessionmaker
+
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.connect() as connection:
+        config = Config(ALEMBIC_INI)
+        config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+        config.attributes["configure_logger"] = False
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        connection.commit()
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for statement in getattr(request.module, "SEED_SQL", []):
+            connection.execute(text(statement))
+
+    # NullPool keeps connections off the TestClient's per-request event loops
+    async_engine = create_async_engine(async_database_url(TEST_DATABASE_URL), poolclass=NullPool)
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with sessions() as db:
+            yield db
+
+    # Not entered as a context manager, so startup hooks (migrations, hot feed, ingestion) stay off
+    scratch = ScratchDatabase(engine, async_engine, TestClient(app))
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        scratch.statements.append(statement)
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: sessions
+    try:
+        yield scratch
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        app.dependency_overrides.pop(get_async_sessionmaker, None)
+        engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def held_data_versions():
+    """Keep the data versions a worker read until the test invalidates them, as between polls"""
+    from services.data_versions import data_versions
+
+    ttl_seconds = data_versions.ttl_seconds
+    data_versions.ttl_seconds = 3600
+    data_versions.invalidate()
+    try:
+        yield data_versions
+    finally:
+        data_versions.ttl_seconds = ttl_seconds
+        data_versions.invalidate()
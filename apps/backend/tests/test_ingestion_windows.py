@@ -0,0 +1,120 @@
+"""
+Windowed ingestion fetches, paged through until a source runs out of results
+"""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+
+import services.ingestion_service as ingestion
+from services.http import UpstreamHTTP
+from services.ingestion_service import IngestionService
+from services.records import PaperRecord
+from services.sources.arxiv import ArxivAdapter
+from services.sources.doaj import DOAJAdapter
+from services.sources.pubmed_central import PubMedCentralAdapter
+
+SINCE = datetime(2024, 1, 1)
+UNTIL = datetime(2024, 1, 8)
+
+
+def paper(n: int) -> PaperRecord:
+    return PaperRecord(
+        title=f"Window paper {n}", authors=["Ada Lovelace"], abstract="graphene", journal="ArXiv", source="ArXiv",
+        published_at=datetime(2024, 1, 7), arxiv_id=f"2401.{n:05d}",
+    )
+
+
+def paged_service(window_size: int):
+    """IngestionService whose sources hold window_size papers, recording the offsets asked for"""
+    service = IngestionService()
+    offsets = []
+
+    async def fetch_source(source, since=None, until=None, offset=0):
+        offsets.append(offset)
+        return [paper(n) for n in range(offset, min(offset + ingestion.INGESTION_MAX_RESULTS, window_size))]
+
+    service.fetch_source = fetch_source
+    return service, offsets
+
+
+def test_window_is_paged_until_a_short_page(monkeypatch):
+    monkeypatch.setattr(ingestion, "INGESTION_MAX_RESULTS", 10)
+
+    service, offsets = paged_service(25)
+    papers, complete = asyncio.run(service.fetch_window("arxiv", SINCE, UNTIL))
+    assert complete
+    assert offsets == [0, 10, 20]
+    assert [p.arxiv_id for p in papers] == [f"2401.{n:05d}" for n in range(25)]
+
+    # A last page that is exactly full needs one empty page to know
+    service, offsets = paged_service(20)
+    papers, complete = asyncio.run(service.fetch_window("arxiv", SINCE, UNTIL))
+    assert complete and offsets == [0, 10, 20] and len(papers) == 20
+
+
+def test_window_cut_off_at_the_page_limit_is_incomplete(monkeypatch):
+    monkeypatch.setattr(ingestion, "INGESTION_MAX_RESULTS", 10)
+    monkeypatch.setattr(ingestion, "INGESTION_MAX_PAGES", 2)
+
+    service, offsets = paged_service(25)
+    papers, complete = asyncio.run(service.fetch_window("arxiv", SINCE, UNTIL))
+    assert not complete
+    assert offsets == [0, 10] and len(papers) == 20
+
+
+def test_multi_page_window_advances_the_watermark(monkeypatch):
+    monkeypatch.setattr(ingestion, "INGESTION_MAX_RESULTS", 10)
+    monkeypatch.setattr(ingestion, "INGESTION_SOURCES", ["arxiv"])
+
+    service, offsets = paged_service(35)
+    written = []
+    monkeypatch.setattr(service, "_try_lock", lambda db: True)
+    monkeypatch.setattr(service, "_unlock", lambda db, acquired: db.close())
+    monkeypatch.setattr(service, "source_query", lambda source: "materials")
+    monkeypatch.setattr(service, "fetch_window_start", lambda source, query, until: SINCE)
+
+    def write_papers(source, papers, query=None, fetched_until=None):
+        written.append((source, len(papers), query, fetched_until))
+        return {"new": len(papers), "upserted": len(papers)}
+
+    monkeypatch.setattr(service, "write_papers", write_papers)
+    results = asyncio.run(service.run_once())
+
+    assert offsets == [0, 10, 20, 30]
+    [(source, count, query, fetched_until)] = written
+    assert (source, count, query) == ("arxiv", 35, "materials")
+    assert fetched_until > UNTIL
+    assert results["arxiv"]["fetched"] == 35
+
+
+def test_adapters_send_the_offset_in_their_paging_parameter():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url)
+        if "esearch" in request.url.path:
+            return httpx.Response(200, json={"esearchresult": {"idlist": []}})
+        if "arxiv" in request.url.host:
+            return httpx.Response(200, text='<feed xmlns="http://www.w3.org/2005/Atom"></feed>')
+        return httpx.Response(200, json={"results": []})
+
+    http = UpstreamHTTP(host_limits={}, rate_limits={}, transport=httpx.MockTransport(handler))
+
+    async def search():
+        try:
+            for adapter in (
+                ArxivAdapter(http, "https://arxiv.test/api/query"),
+                PubMedCentralAdapter(http, "https://pmc.test/eutils"),
+                DOAJAdapter(http, "https://doaj.test/api/search/articles"),
+            ):
+                await adapter.search("graphene", 50, SINCE, UNTIL, offset=100)
+        finally:
+            await http.close()
+
+    asyncio.run(search())
+    arxiv, pmc, doaj = (url.params for url in requests)
+    assert (arxiv["start"], arxiv["max_results"]) == ("100", "50")
+    assert (pmc["retstart"], pmc["retmax"]) == ("100", "50")
+    assert (doaj["page"], doaj["pageSize"]) == ("3", "50")
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from services.metrics import server_timing_header, statement_labels
+
+
+def test_statement_labels():
+    assert statement_labels("SELECT research_papers.id FROM research_papers WHERE id = $1") == ("select", "research_papers")
+    assert statement_labels('INSERT INTO "upstream_cache" (key) VALUES (%(key)s)') == ("insert", "upstream_cache")
+    assert statement_labels("UPDATE fetch_watermarks SET last_run_at = now()") == ("update", "fetch_watermarks")
+    assert statement_labels("SELECT 1") == ("select", "")
+
+
+def test_server_timing_header():
+    assert server_timing_header({"db": 0.0123, "encode": 0.0004}, 0.02) == "db;dur=12.3, encode;dur=0.4, total;dur=20.0"
+
+
+def test_responses_carry_server_timing_and_feed_metrics():
+    # Not entered as a context manager, so startup hooks (migrations, ingestion) stay off
+    client = TestClient(app)
+
+    response = client.get("/")
+    assert response.headers["server-timing"].startswith("encode;dur=")
+
+    scrape = client.get("/metrics")
+    assert scrape.headers["content-type"].startswith("text/plain; version=")
+    assert 'masot_http_request_duration_seconds_count{method="GET",route="/",status="200"}' in scrape.text
+    assert "masot_upstream_cache_hit_ratio" in scrape.text
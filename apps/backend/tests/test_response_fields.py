@@ -0,0 +1,26 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from api.schemas import PAPER_FIELDS, FastJSONResponse, parse_fields
+
+
+def test_fields_default_to_the_whole_schema():
+    assert parse_fields(None, PAPER_FIELDS) == list(PAPER_FIELDS)
+
+
+def test_fields_keep_schema_order_and_cursor_keys():
+    assert parse_fields("doi, title", PAPER_FIELDS) == ["id", "title", "published_at", "doi"]
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("title,search_vector", PAPER_FIELDS)
+    assert error.value.status_code == 400
+
+
+def test_response_encodes_decimals_and_datetimes():
+    body = FastJSONResponse({"impact_factor": Decimal("3.125"), "published_at": datetime(2024, 1, 5)}).body
+    assert body == b'{"impact_factor":3.125,"published_at":"2024-01-05T00:00:00"}'
@@ -0,0 +1,150 @@
+"""
+Source adapter registry and the fan-out executor, with in-process adapters
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from services.http import UpstreamHTTP
+from services.records import PaperRecord
+from services.resilience import QueueTimeoutError
+from services.sources import SOURCE_ADAPTERS, SourceAdapter, SourceExecutor, create_adapters, register_adapter
+from services.sources.pubmed_central import PubMedCentralAdapter
+
+
+class SlowAdapter(SourceAdapter):
+    """Returns one paper after a delay, counting how many run at once"""
+
+    display_name = "Slow"
+    running = 0
+    peak = 0
+
+    async def search(self, query, max_results=20, since=None, until=None, offset=0) -> List[PaperRecord]:
+        SlowAdapter.running += 1
+        SlowAdapter.peak = max(SlowAdapter.peak, SlowAdapter.running)
+        await asyncio.sleep(0.02)
+        SlowAdapter.running -= 1
+        return [self.make_paper(title=f"{query} paper", authors=["Ada Lovelace"], abstract="graphene", journal="Slow", published_at="2024")]
+
+
+class PacedAdapter(SourceAdapter):
+    """Makes one request to its upstream per search"""
+
+    display_name = "Paced"
+
+    async def search(self, query, max_results=20, since=None, until=None, offset=0) -> List[PaperRecord]:
+        await self.http.get(self.base_url, params={"q": query})
+        return []
+
+
+async def collect(executor: SourceExecutor) -> Dict[str, Dict[str, Any]]:
+    return {source: status async for source, _, status in executor.fan_out("alloys", 5, budget_seconds=None)}
+
+
+def test_fan_out_runs_every_source_with_bounded_parallelism():
+    SlowAdapter.peak = 0
+    executor = SourceExecutor({f"slow_{i}": SlowAdapter() for i in range(6)}, max_parallel=2)
+
+    statuses = asyncio.run(collect(executor))
+
+    assert sorted(statuses) == [f"slow_{i}" for i in range(6)]
+    assert all(status["status"] == "ok" and status["count"] == 1 for status in statuses.values())
+    assert SlowAdapter.peak == 2
+
+
+def test_registered_adapter_is_created_and_unavailable_ones_skipped():
+    @register_adapter
+    class ExampleAdapter(SlowAdapter):
+        name = "example"
+
+    try:
+        assert list(create_adapters(sources=["example", "core", "missing"])) == ["example"]
+    finally:
+        SOURCE_ADAPTERS.pop("example")
+
+
+def test_adapter_records_share_the_normalized_shape():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("esearch.fcgi"):
+            return httpx.Response(200, json={"esearchresult": {"idlist": ["123"]}})
+        return httpx.Response(200, json={"result": {"uids": ["123"], "123": {
+            "title": "Graphene membranes",
+            "authors": [{"name": "Lovelace A"}],
+            "pubdate": "2024 Jan 5",
+            "elocationid": "doi: 10.1000/ABC.1",
+        }}})
+
+    http = UpstreamHTTP(host_limits={}, rate_limits={}, transport=httpx.MockTransport(handler))
+    adapter = PubMedCentralAdapter(http, "https://pmc.test/eutils")
+
+    async def search():
+        try:
+            return await adapter.search("graphene", 5)
+        finally:
+            await http.close()
+
+    papers = asyncio.run(search())
+    assert isinstance(papers[0], PaperRecord)
+    assert papers[0].doi == "10.1000/abc.1"
+    assert papers[0].source == "PubMed Central"
+    assert papers[0].published_at == datetime(2024, 1, 5, tzinfo=timezone.utc)
+
+
+def guarded_searches(handler, searches: int, rate_limits=None) -> tuple:
+    """Run searches one after another on a paced source with a 0.1s deadline, returning the errors and breaker"""
+    http = UpstreamHTTP(host_limits={}, rate_limits=rate_limits or {}, transport=httpx.MockTransport(handler))
+    executor = SourceExecutor({"paced": PacedAdapter(http, "https://paced.test/search")})
+    executor.timeouts["paced"] = 0.1
+
+    async def run():
+        errors = []
+        try:
+            for _ in range(searches):
+                try:
+                    await executor.fetch_guarded("paced", "alloys")
+                    errors.append(None)
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            await http.close()
+        return errors
+
+    return asyncio.run(run()), executor.breakers["paced"]
+
+
+def test_deadline_spent_in_the_rate_limit_queue_does_not_open_the_breaker():
+    # One request per 10s: the first goes out, the rest wait out their deadline in the queue
+    errors, breaker = guarded_searches(lambda request: httpx.Response(200), 4, {"paced.test": (0.1, 1)})
+
+    assert errors[0] is None
+    assert all(isinstance(error, QueueTimeoutError) for error in errors[1:])
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+@pytest.mark.parametrize("searches", [1, 3])
+def test_slow_upstream_timeouts_count_as_failures(searches):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1)
+        return httpx.Response(200)
+
+    errors, breaker = guarded_searches(handler, searches)
+
+    assert all(isinstance(error, asyncio.TimeoutError) and not isinstance(error, QueueTimeoutError) for error in errors)
+    assert breaker.failures == searches
+    assert breaker.state == ("open" if searches == 3 else "closed")
+
+
+def test_untitled_arxiv_entry_has_an_empty_title():
+    import xml.etree.ElementTree as ET
+
+    from services.sources.arxiv import ArxivAdapter
+
+    entry = ET.fromstring(
+        '<entry xmlns="http://www.w3.org/2005/Atom"><id>http://arxiv.org/abs/2401.00001v1</id>'
+        '<published>2024-01-05T18:00:00Z</published><summary>graphene</summary></entry>'
+    )
+    assert ArxivAdapter()._entry_to_paper(entry).title == ""
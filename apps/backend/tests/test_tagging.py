@@ -0,0 +1,22 @@
+"""
+Materials tagger, batch tagging against per-text tagging
+"""
+
+from services.tagging import materials_tagger
+
+
+def test_batch_tags_match_single_texts_after_length_changing_lowercase():
+    # "İ".lower() is two code points, which used to shift every later offset
+    texts = [
+        "İİİİİİİİİİ steel alloy",
+        "A graphene battery",
+        None,
+        "İstanbul polymer resin",
+        "ceramic oxide",
+    ]
+    assert materials_tagger.tag_many(texts) == [materials_tagger.tag(text) for text in texts]
+
+
+def test_batch_tags_keep_each_keyword_in_its_own_document():
+    texts = ["İ" * 40 + " synthesis", "no terms here"]
+    assert materials_tagger.tag_many(texts)[1] == ([], [])
@@ -0,0 +1,133 @@
+"""
+Upstream request scheduler against a fake provider that enforces its own
+rate limit, answering 429 with Retry-After like NCBI and DOAJ do.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import List, Optional
+
+import httpx
+
+from services.http import UpstreamHTTP
+from services.scheduler import retry_after_seconds
+
+HOST = "api.example.org"
+URL = f"https://{HOST}/search"
+
+
+class FakeProvider:
+    """Token-bucket-limited upstream, as an httpx transport"""
+
+    def __init__(self, rate: float, burst: float, retry_after: str = "0.05", fail_first: int = 0, fail_status: int = 503):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.retry_after = retry_after
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.calls = 0
+        self.throttled = 0
+        self.received: List[Optional[str]] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            self.throttled += 1
+            return httpx.Response(429, headers={"Retry-After": self.retry_after})
+        self.tokens -= 1
+
+        if self.calls <= self.fail_first:
+            return httpx.Response(self.fail_status)
+        self.received.append(request.url.params.get("i"))
+        return httpx.Response(200, json={"ok": True})
+
+    def client(self, **kwargs) -> UpstreamHTTP:
+        kwargs.setdefault("host_limits", {})
+        kwargs.setdefault("retry_base_seconds", 0.01)
+        return UpstreamHTTP(transport=httpx.MockTransport(self.handle), **kwargs)
+
+
+async def fetch_all(http: UpstreamHTTP, count: int) -> List[int]:
+    try:
+        responses = await asyncio.gather(*(http.get(URL, params={"i": i}) for i in range(count)))
+    finally:
+        await http.close()
+    return [response.status_code for response in responses]
+
+
+def test_paced_requests_stay_within_provider_limit():
+    # One token of slack on the server for timer granularity
+    provider = FakeProvider(rate=50, burst=3)
+    http = provider.client(rate_limits={HOST: (50, 2)})
+
+    start = time.monotonic()
+    statuses = asyncio.run(fetch_all(http, 30))
+    elapsed = time.monotonic() - start
+
+    assert statuses == [200] * 30
+    assert provider.throttled == 0
+    # 2 from the burst, the other 28 at 50/s
+    assert elapsed >= 28 / 50 * 0.9
+
+    metrics = http.metrics()[HOST]
+    assert metrics["requests"] == 30
+    assert metrics["retries"] == 0
+    assert metrics["queue_depth"] == 0
+    assert metrics["wait_seconds_max"] > 0
+
+
+def test_requests_are_served_in_arrival_order():
+    provider = FakeProvider(rate=100, burst=10)
+    http = provider.client(rate_limits={HOST: (40, 1)})
+
+    asyncio.run(fetch_all(http, 10))
+
+    assert provider.received == [str(i) for i in range(10)]
+
+
+def test_throttling_pauses_the_provider_and_retries():
+    # Configured faster than the provider really allows
+    provider = FakeProvider(rate=20, burst=1)
+    http = provider.client(rate_limits={HOST: (100, 5)}, max_retries=10)
+
+    statuses = asyncio.run(fetch_all(http, 10))
+
+    assert statuses == [200] * 10
+    assert provider.throttled > 0
+    metrics = http.metrics()[HOST]
+    assert metrics["throttled"] == provider.throttled
+    assert metrics["retries"] == provider.throttled
+
+
+def test_server_errors_are_retried_with_backoff():
+    provider = FakeProvider(rate=100, burst=10, fail_first=2)
+    http = provider.client(rate_limits={HOST: (100, 10)})
+
+    assert asyncio.run(fetch_all(http, 1)) == [200]
+    assert provider.calls == 3
+    assert http.metrics()[HOST]["retries"] == 2
+
+
+def test_gives_up_after_max_retries():
+    provider = FakeProvider(rate=100, burst=10, fail_first=100, fail_status=502)
+    http = provider.client(rate_limits={}, max_retries=2)
+
+    assert asyncio.run(fetch_all(http, 1)) == [502]
+    assert provider.calls == 3
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "3"})) == 3.0
+    assert retry_after_seconds(httpx.Response(429)) is None
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    seconds = retry_after_seconds(httpx.Response(429, headers={"Retry-After": format_datetime(later, usegmt=True)}))
+    assert 28 <= seconds <= 30